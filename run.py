@@ -6,8 +6,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 from src.aquaphotomics.aquaphotomics_app_monolith import AquaphotomicsApp, VERSION_STRING
 
 def run_app():
-    print(VERSION_STRING)
-    print(f"Working directory: {os.path.realpath(os.getcwd())}")
+    sys.stdout.write(f"{VERSION_STRING}\nWorking directory: {os.getcwd()}\n")
 
     app = AquaphotomicsApp()
     app.mainloop()
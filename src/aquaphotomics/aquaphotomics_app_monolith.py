@@ -27,19 +27,20 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
 from matplotlib.ticker import MultipleLocator, AutoLocator, FormatStrFormatter
-from scipy.interpolate import interp1d
 from functools import partial
 import collections
-import mpmath as mp
 from typing import List, Dict, Any, Optional, Tuple, Union
 import traceback
 
+# scipy.interpolate and mpmath are imported where they are used (plot_data,
+# record_amplitude) so they don't slow down opening the main window.
+
 # Configure matplotlib
 warnings.simplefilter("ignore")
 matplotlib.use("TkAgg")
 matplotlib.rcParams["toolbar"] = "toolmanager"
 
-from .config.config_manager import Config
+from .config.config_manager import config
 
 # Import the appropriate serial port detection based on the OS
 if os.name == "linux":
@@ -51,7 +52,7 @@ else:
 
 # Add imports for new digital twin and serial_comm
 from serial_comm.digital_twin import DigitalTwinSerialDevice
-from src.aquaphotomics.core.serial_device import SerialDeviceController
+from src.aquaphotomics.core.serial_device import SerialDeviceController, invalidate_port_cache
 
 #------------------------------------------------------------------------------
 # CONSTANTS AND CONFIGURATION
@@ -144,6 +145,8 @@ class MeasurementData:
         if not self.amp_file_path:
             raise DataProcessingError("No amplitude file selected")
             
+        import mpmath as mp
+
         header = [data[0], data[1], data[2]]
         mp.dps = 66
         Kadc = mp.mpf(45.7763672E-6)
@@ -402,6 +405,8 @@ class AquaphotomicsFigures(FigureCollection):
             a_r: List of r values (measurements)
             a_name: Name for the dataset in legends
         """
+        from scipy.interpolate import interp1d
+
         # Plot linear data
         plt.figure(2)
         fig = plt.figure(2)
@@ -698,7 +703,8 @@ class ConnectionDialog(tk_sd.Dialog):
     
     def refresh_ports(self):
         """Refresh the list of available ports."""
-        # Get ports from the device (could be real or mock)
+        # Get ports from the device (could be real or mock); an explicit refresh skips the cached scan
+        invalidate_port_cache()
         self.port_list = self.device.scan_ports()
         self.port_menu['values'] = self.port_list
 
@@ -899,9 +905,8 @@ class AquaphotomicsApp(tk.Tk):
         self.project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
         print(f"Project Root determined as: {self.project_root}")
 
-        # Load configuration using ConfigManager
-        # ConfigManager currently loads from '.' which works because run.py is at the root
-        self.app_config = Config() 
+        # Use the process-wide configuration shared with core.serial_device
+        self.app_config = config
         
         # Basic window setup
         self.title(VERSION_STRING)
@@ -928,7 +933,9 @@ class AquaphotomicsApp(tk.Tk):
         # Ensure output directory exists *before* creating user/files
         try:
             print(f"Ensuring output directory exists: {self.app_config.output.directory}")
-            os.makedirs(self.app_config.output.directory, exist_ok=True)
+            # The directory exists on every launch after the first, so check before creating
+            if not os.path.isdir(self.app_config.output.directory):
+                os.makedirs(self.app_config.output.directory, exist_ok=True)
         except Exception as e:
             # Handle potential errors creating directory (e.g., permissions)
             print(f"ERROR: Could not create output directory '{self.app_config.output.directory}': {e}")
@@ -1653,7 +1660,7 @@ class AquaphotomicsApp(tk.Tk):
     def new_user(self):
         """Create/set a user profile automatically with a timestamp, saving to configured dir."""
         # Generate automatic user name and file path
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        timestamp = self.app_config.output.format_timestamp()
         user_name = f"TestUser_{timestamp}"
         # Use configured output directory (already ensured to exist by __init__)
         file_path = os.path.join(self.app_config.output.directory, f"{user_name}_data.csv")
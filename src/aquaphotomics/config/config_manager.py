@@ -1,95 +1,294 @@
 import yaml
-from typing import Any, Dict, Optional
+import hashlib
+import json
+from typing import Any, Callable, Dict, Optional, Tuple
 import os
+import sys
 import logging
+from collections import deque
+from dataclasses import dataclass, field, fields
+from datetime import datetime
 from types import SimpleNamespace
 
 logger = logging.getLogger(__name__)
 
+# libyaml's C parser and emitter when PyYAML was built with it, pure Python otherwise
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# Parsed YAML documents keyed by (real path, mtime), so repeated Config()
+# constructions in the same process don't re-parse an unchanged file.
+_CONFIG_CACHE: Dict[Tuple[str, float], Dict[str, Any]] = {}
+
+# Parsed config files are also stored as JSON in the per-user cache directory, which loads
+# much faster than YAML on the next interpreter start. Nothing is ever written next to the
+# config file itself, which may live inside the installed package.
+def _json_cache_path(config_file: str) -> str:
+    """Returns where the parsed contents of config_file are cached, named after its real path."""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    digest = hashlib.sha1(os.path.realpath(config_file).encode('utf-8', 'surrogateescape')).hexdigest()
+    return os.path.join(base, 'aquaphotomics', f'config-{digest}.json')
+
+def _load_json_cache(config_file: str, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+    """Returns the cached parse of config_file, or None if missing or stale."""
+    try:
+        with open(_json_cache_path(config_file), 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (not isinstance(cached, dict) or cached.get('path') != os.path.realpath(config_file)
+            or cached.get('mtime_ns') != stat.st_mtime_ns or cached.get('size') != stat.st_size):
+        return None
+    return cached.get('data')
+
+def _save_json_cache(config_file: str, stat: os.stat_result, data: Dict[str, Any]):
+    """Caches the parse of config_file, keyed by the file's real path, mtime and size."""
+    try:
+        payload = json.dumps({'path': os.path.realpath(config_file), 'mtime_ns': stat.st_mtime_ns,
+                              'size': stat.st_size, 'data': data})
+        # JSON only has string keys and no dates; skip documents that wouldn't come back identical
+        if json.loads(payload)['data'] != data:
+            return
+        cache_path = _json_cache_path(config_file)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(payload)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Could not write config cache for '%s': %s", config_file, e)
+
+def _timestamp_formatter(timestamp_format: str):
+    """Returns a function formatting a datetime (default: now) with the fixed timestamp_format."""
+    def format_timestamp(dt: Optional[datetime] = None) -> str:
+        return (dt or datetime.now()).strftime(timestamp_format)
+    return format_timestamp
+
+@dataclass(frozen=True, slots=True)
+class OutputConfig:
+    """The 'output' section of config.yaml."""
+    directory: str = 'output_data'
+    save_timestamp: bool = True
+    timestamp_format: str = "%Y%m%d_%H%M%S"
+    format_timestamp: Callable[..., str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Frozen: fields can only be filled in here through object.__setattr__
+        if not isinstance(self.timestamp_format, str):
+            object.__setattr__(self, 'timestamp_format', _DEFAULT_OUTPUT['timestamp_format'])
+        # Bind the format once so callers don't look it up on every file name
+        object.__setattr__(self, 'format_timestamp', _timestamp_formatter(self.timestamp_format))
+
+@dataclass(frozen=True, slots=True)
+class SerialConfig:
+    """The 'serial' section of config.yaml."""
+    com_port: str = 'COM4'
+    baud_rate: int = 115200
+    use_mock_device: bool = False
+    mock_port_name: str = 'MOCK_COM'
+    perform_handshake: bool = True
+    handshake_timeout_s: float = 0.5
+    handshake_poll_interval_s: float = 0.01
+    command_timeout: float = 30.0
+    command_retry_count: int = 3
+    command_delay: float = 0.05
+    read_timeout: float = 0.1
+    write_timeout: float = 1.0
+    response_idle_threshold: int = 3
+    complete_on_idle: bool = True
+    background_reader: bool = False
+    on_no_response_action: str = 'retry'
+    reconnect_delay: float = 1.0
+    log_interval: float = 1.0
+    read_interval: float = 0.01
+    log_max_entries: int = 10000
+
+def _field_defaults(section_type: type) -> Dict[str, Any]:
+    """Returns the declared defaults of a config section's settings."""
+    return {f.name: f.default for f in fields(section_type) if f.init}
+
+_SECTION_TYPES: Dict[str, type] = {'output': OutputConfig, 'serial': SerialConfig}
+
+_DEFAULT_OUTPUT: Dict[str, Any] = _field_defaults(OutputConfig)
+_DEFAULT_SERIAL: Dict[str, Any] = _field_defaults(SerialConfig)
+
+# Built once per process; treat as read-only and copy before handing out
+_DEFAULTS: Dict[str, Dict[str, Any]] = {'output': _DEFAULT_OUTPUT, 'serial': _DEFAULT_SERIAL}
+
+def _section_from_dict(section_name: str, data: Dict[str, Any]) -> Any:
+    """Builds a known config section from a dict, ignoring keys the section doesn't declare."""
+    settings = _DEFAULTS[section_name]
+    return _SECTION_TYPES[section_name](**{key: value for key, value in data.items() if key in settings})
+
+# Minimum for durations that must be strictly positive: a zero timeout or polling interval
+# would make every command time out at once or turn a wait into a busy loop.
+_POSITIVE = 1e-9
+
+# (name, accepted types, minimum) for each serial setting; minimum is None for non-numeric settings.
+_SERIAL_SCHEMA = (
+    ('com_port', (str,), None),
+    ('baud_rate', (int,), 1),
+    ('use_mock_device', (bool,), None),
+    ('mock_port_name', (str,), None),
+    ('perform_handshake', (bool,), None),
+    ('handshake_timeout_s', (int, float), _POSITIVE),
+    ('handshake_poll_interval_s', (int, float), _POSITIVE),
+    ('command_timeout', (int, float), _POSITIVE),
+    ('command_retry_count', (int,), 1),
+    ('command_delay', (int, float), 0),
+    ('read_timeout', (int, float), _POSITIVE),
+    ('write_timeout', (int, float), _POSITIVE),
+    ('response_idle_threshold', (int,), 1),
+    ('complete_on_idle', (bool,), None),
+    ('background_reader', (bool,), None),
+    ('on_no_response_action', (str,), None),
+    ('reconnect_delay', (int, float), 0),
+    ('log_interval', (int, float), _POSITIVE),
+    ('read_interval', (int, float), _POSITIVE),
+    ('log_max_entries', (int,), 1),
+)
+
+def _merge_defaults(defaults: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns a copy of defaults overlaid with overrides, walking nested dicts with a queue instead of recursion."""
+    merged = dict(defaults)
+    pending = deque([(merged, overrides)])
+    while pending:
+        target, source = pending.popleft()
+        for key, value in source.items():
+            # Interned keys let later lookups against the literal setting names compare by identity
+            if isinstance(key, str):
+                key = sys.intern(key)
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                # Copy before descending so the shared defaults are never mutated
+                current = target[key] = dict(current)
+                pending.append((current, value))
+            else:
+                target[key] = value
+    return merged
+
+def _validate_serial_config(serial: Dict[str, Any]) -> Dict[str, Any]:
+    """Replaces missing, mistyped or out-of-range serial settings with their defaults, in place."""
+    invalid = []
+    for name, types, minimum in _SERIAL_SCHEMA:
+        value = serial.get(name)
+        # bool is an int subclass, so it only passes where bool is asked for explicitly
+        valid = isinstance(value, types) and not (isinstance(value, bool) and bool not in types)
+        if valid and (minimum is None or value >= minimum):
+            continue
+        if name in serial:
+            invalid.append(f"{name}={value!r} (default {_DEFAULT_SERIAL[name]!r})")
+        serial[name] = _DEFAULT_SERIAL[name]
+    if invalid:
+        logger.warning("Invalid serial settings, using defaults: %s", ", ".join(invalid))
+    return serial
+
+def _to_namespace(data: Dict[str, Any]) -> SimpleNamespace:
+    """Converts a (possibly nested) dict into SimpleNamespaces, one constructor call per dict."""
+    return SimpleNamespace(**{key: _to_namespace(value) if isinstance(value, dict) else value
+                              for key, value in data.items()})
+
 class Config:
-    def __init__(self):
-        # Get the directory where config_manager.py is located
-        config_dir = os.path.dirname(os.path.abspath(__file__))
-        # Construct path to config.yaml in the same directory
-        self._config_file = os.path.join(config_dir, 'config.yaml')
+    # Shared instance for the default config.yaml; explicit files get their own instance
+    _instance: Optional['Config'] = None
+
+    def __new__(cls, config_file: Optional[str] = None):
+        if config_file is not None:
+            return super().__new__(cls)
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, config_file: Optional[str] = None):
+        if '_config_file' in self.__dict__:
+            # The shared instance is already set up; don't drop what it has loaded
+            return
+        if config_file is None:
+            # Get the directory where config_manager.py is located
+            config_dir = os.path.dirname(os.path.abspath(__file__))
+            # Construct path to config.yaml in the same directory
+            config_file = os.path.join(config_dir, 'config.yaml')
+        self._config_file = config_file
+        # Loaded on first section access, so importing this module does no I/O
+        self._config_dict: Optional[Dict[str, Any]] = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes not set yet, i.e. config sections before the first load
+        if name.startswith('_') or self._config_dict is not None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
         self._config_dict = self._load_config()
+        return getattr(self, name)
 
     def _load_config(self) -> Dict[str, Any]:
         try:
-            if os.path.exists(self._config_file):
-                with open(self._config_file, 'r') as f:
-                    config_data = yaml.safe_load(f)
+            with open(self._config_file, 'r') as f:
+                stat = os.fstat(f.fileno())
+                cache_key = (os.path.realpath(self._config_file), stat.st_mtime)
+                config_data = _CONFIG_CACHE.get(cache_key)
+                if config_data is None:
+                    config_data = _load_json_cache(self._config_file, stat)
                     if config_data is None:
-                        logger.warning(f"Configuration file '{self._config_file}' is empty. Using defaults.")
-                        return self._get_default_config()
-                    
-                    # Convert the loaded YAML to objects with attribute access
-                    for section_name, section_data in config_data.items():
-                        if isinstance(section_data, dict):
-                            # Use SimpleNamespace for each config section
-                            setattr(self, section_name, SimpleNamespace(**section_data))
-                        else:
-                            # Set top-level primitives directly
-                            setattr(self, section_name, section_data)
-                    
-                    return config_data
-            else:
-                logger.warning(f"Configuration file '{self._config_file}' not found. Creating default.")
-                self._create_default_config()
-                
+                        config_data = yaml.load(f, Loader=_YamlLoader)
+                        if isinstance(config_data, dict):
+                            _save_json_cache(self._config_file, stat, config_data)
+                    if config_data is None:
+                        logger.warning("Configuration file '%s' is empty. Using defaults.", self._config_file)
+                        config_data = self._get_default_config()
+                        self._apply_config(config_data)
+                        return config_data
+                    config_data = _merge_defaults(_DEFAULTS, config_data)
+                    if isinstance(config_data.get('serial'), dict):
+                        _validate_serial_config(config_data['serial'])
+                    _CONFIG_CACHE[cache_key] = config_data
+
+            # Convert the loaded YAML to objects with attribute access
+            self._apply_config(config_data)
+            return config_data
+        except FileNotFoundError:
+            logger.warning("Configuration file '%s' not found. Creating default.", self._config_file)
+            if self._create_default_config():
                 # Load again after creating the default
                 return self._load_config()
+            default_config = self._get_default_config()
+            self._apply_config(default_config)
+            return default_config
         except Exception as e:
-            logger.error(f"Error loading configuration file '{self._config_file}': {e}. Using defaults.")
+            logger.error("Error loading configuration file '%s': %s. Using defaults.", self._config_file, e)
             default_config = self._get_default_config()
             
             # Convert default config to objects with attribute access
-            for section_name, section_data in default_config.items():
-                if isinstance(section_data, dict):
-                    setattr(self, section_name, SimpleNamespace(**section_data))
-                else:
-                    setattr(self, section_name, section_data)
-                    
+            self._apply_config(default_config)
             return default_config
+
+    def _apply_config(self, config_data: Dict[str, Any]):
+        """Exposes each config section as an attribute (known sections as dataclasses, other dicts as namespaces)."""
+        # One dict.update instead of a setattr per section
+        self.__dict__.update({
+            section_name: (_section_from_dict(section_name, section_data) if section_name in _SECTION_TYPES
+                           else _to_namespace(section_data)) if isinstance(section_data, dict) else section_data
+            for section_name, section_data in config_data.items()
+        })
     
     def _get_default_config(self) -> Dict[str, Any]:
-        """Returns the default configuration dictionary."""
-        return {
-            'output': {
-                'directory': 'output_data',
-                'save_timestamp': True,
-                'timestamp_format': "%Y%m%d_%H%M%S"
-            },
-            'serial': {
-                'com_port': 'COM4',
-                'baud_rate': 115200,
-                'use_mock_device': False,
-                'mock_port_name': 'MOCK_COM',
-                'perform_handshake': True,
-                'handshake_timeout_s': 0.5,
-                'handshake_poll_interval_s': 0.01,
-                'command_timeout': 30.0,
-                'command_retry_count': 3,
-                'command_delay': 0.05,
-                'read_timeout': 0.1,
-                'response_idle_threshold': 3,
-                'on_no_response_action': 'retry',
-                'reconnect_delay': 1.0,
-                'log_interval': 1.0,
-                'read_interval': 0.01
-            }
-        }
+        """Returns a copy of the default configuration dictionary."""
+        return {section: dict(values) for section, values in _DEFAULTS.items()}
     
-    def _create_default_config(self):
-        """Creates a default config.yaml file if it doesn't exist."""
+    def _create_default_config(self) -> bool:
+        """Creates a default config.yaml file if it doesn't exist. Returns False if it could not be created."""
         try:
-            if not os.path.exists(self._config_file):
-                logger.info(f"Creating default configuration file: {self._config_file}")
-                with open(self._config_file, 'w') as f:
-                    yaml.dump(self._get_default_config(), f, default_flow_style=False, sort_keys=False)
+            with open(self._config_file, 'x') as f:
+                logger.info("Creating default configuration file: %s", self._config_file)
+                yaml.dump(_DEFAULTS, f, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False)
+        except FileExistsError:
+            pass
         except Exception as e:
-            logger.error(f"Error creating default config file '{self._config_file}': {e}")
+            logger.error("Error creating default config file '%s': %s", self._config_file, e)
+            return False
+        return True
 
-# Create and export a singleton instance
+# The shared instance; nothing is read until a section is first accessed
 config = Config()
 
@@ -1,29 +1,196 @@
-import serial
-import serial.tools.list_ports
 import logging
-from typing import Optional, Tuple, Any
-from datetime import datetime
-import time  
-from src.aquaphotomics.config.config_manager import config
+import os
+import select
+import struct
+import sys
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Tuple, Any
 import time
+from src.aquaphotomics.config.config_manager import config
+
+# pyserial is imported where it is used, so importing this module stays cheap
+if TYPE_CHECKING:
+    import serial
+
+
+# Response terminator used by the device protocol
+CRLF = b'\r\n'
+
+# Largest read taken straight from the port's file descriptor
+_READ_CHUNK_SIZE = 4096
+
+# Controller response layouts. send_command_and_with_response_polling returns the reply decoded
+# to str with CR/LF stripped, so these are str rather than bytes.
+_SIGNAL_PREFIX = ':03'
+_SIGNAL_LENGTH = 13             # ':03' + channel + signal type + 8 hex digits
+_SIGNAL_VALUE = slice(5, 13)
+_MEASURE_PREFIX = ':08'
+_MEASURE_LENGTH = 17            # ':08' + 2-digit channel + 3 x 4 hex digits
+_MEASURE_VALUES = slice(5, 17)
+_ACK = ':00'
+_HANDSHAKE_REPLY = ':55555555'
+
+# Three big-endian 16-bit ADC readings, as sent hex-encoded in a measure response
+_ADC_READINGS = struct.Struct('>HHH')
+
+# How long an enumerated port list is reused before comports() is called again
+_PORTS_CACHE_TTL_S = 1.0
+
+# (monotonic time of last enumeration, port names), shared by every connection and controller
+_ports_cache: Tuple[float, list] = (0.0, [])
+
+def _available_ports() -> list[str]:
+    """Port names from comports(), re-enumerated at most every _PORTS_CACHE_TTL_S."""
+    global _ports_cache
+    now = time.monotonic()
+    cached_at, ports = _ports_cache
+    if not cached_at or now - cached_at >= _PORTS_CACHE_TTL_S:
+        import serial.tools.list_ports
+        ports = [port.device for port in serial.tools.list_ports.comports()]
+        _ports_cache = (now, ports)
+    return list(ports)
+
+def invalidate_port_cache():
+    """Forces the next port scan to enumerate again, e.g. when the user asks for a refresh."""
+    global _ports_cache
+    _ports_cache = (0.0, [])
+
 
+@lru_cache(maxsize=256)
+def _wire(command: str) -> bytes:
+    """Return the bytes written for a stripped text command; the command vocabulary is small, so these repeat."""
+    return (command + '\r\n').encode('ascii')
 
 
+def format_log_timestamp(timestamp_ns: int) -> str:
+    """Formats a communication log 'timestamp_ns' as local 'YYYY-MM-DD HH:MM:SS.mmm', without going through strftime."""
+    seconds, ns = divmod(timestamp_ns, 1_000_000_000)
+    lt = time.localtime(seconds)
+    return (f"{lt.tm_year}-{lt.tm_mon:02d}-{lt.tm_mday:02d} "
+            f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}.{ns // 1_000_000:03d}")
+
 class SerialCommunicationError(Exception):
     """Exception raised when serial device setup fails."""
     pass
 
+class CommunicationLog:
+    """
+    Bounded command history kept as one deque per field rather than a dict per entry.
+    Indexing and iteration yield the familiar {'timestamp_ns', 'sent', 'received', 'success'}
+    dicts, built on demand; the column deques can be read directly for bulk export.
+    """
+
+    _FIELDS = ('timestamp_ns', 'sent', 'received', 'success')
+
+    def __init__(self, maxlen: Optional[int] = None):
+        # Same maxlen on every column, so they always evict together
+        self.timestamps_ns = deque(maxlen=maxlen)
+        self.sent = deque(maxlen=maxlen)
+        self.received = deque(maxlen=maxlen)
+        self.success = deque(maxlen=maxlen)
+
+    def append(self, timestamp_ns: int, sent: str, received: str, success: bool) -> None:
+        self.timestamps_ns.append(timestamp_ns)
+        self.sent.append(sent)
+        self.received.append(received)
+        self.success.append(success)
+
+    def clear(self) -> None:
+        for column in (self.timestamps_ns, self.sent, self.received, self.success):
+            column.clear()
+
+    def __len__(self) -> int:
+        return len(self.sent)
+
+    def __getitem__(self, index: int) -> dict:
+        return dict(zip(self._FIELDS, (self.timestamps_ns[index], self.sent[index],
+                                       self.received[index], self.success[index])))
+
+    def __iter__(self):
+        for row in zip(self.timestamps_ns, self.sent, self.received, self.success):
+            yield dict(zip(self._FIELDS, row))
+
+
+class _ProgressWatchdog:
+    """
+    Runs the progress logger of the response wait in progress on one long-lived daemon thread,
+    so a command doesn't start a thread of its own. The thread exits after idling for a while
+    and is started again by the next arm().
+    """
+
+    _IDLE_EXIT_S = 60.0
+    # Shortest reschedule honoured, so a callback returning 0 can't turn the thread into a busy loop
+    _MIN_DELAY_S = 0.01
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        # [callback, due monotonic time] of the watched wait; the callback returns its next delay
+        self._job: Optional[list] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def arm(self, callback, delay: float):
+        with self._cond:
+            self._job = [callback, time.monotonic() + delay]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="serial-progress", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def disarm(self):
+        with self._cond:
+            self._job = None
+
+    def _run(self):
+        cond = self._cond
+        with cond:
+            while True:
+                job = self._job
+                if job is None:
+                    if not cond.wait(self._IDLE_EXIT_S) and self._job is None:
+                        self._thread = None
+                        return
+                    continue
+                delay = job[1] - time.monotonic()
+                if delay > 0:
+                    cond.wait(delay)
+                    continue
+                # Log without holding the lock, so disarm() never waits on a handler
+                cond.release()
+                try:
+                    next_delay = job[0]()
+                finally:
+                    cond.acquire()
+                if self._job is job:
+                    job[1] = time.monotonic() + max(next_delay, self._MIN_DELAY_S)
+
+
 class SerialConnection:
-    def __init__(self, com_port: str, baud_rate: int):
-        self.serial_conn: Optional[serial.Serial] = None
+    def __init__(self, com_port: Optional[str] = None, baud_rate: Optional[int] = None):
+        self.serial_conn: Optional['serial.Serial'] = None
+        # Last timeout applied to serial_conn; the setter is a driver call, so skip repeats
+        self._last_timeout = None
+        # Descriptor wait_for_response reads directly, resolved once per connection
+        self._fd: Optional[int] = None
+        # Optional background reader (serial.background_reader): it appends to _rx and sets _rx_event
+        self._reader: Optional[threading.Thread] = None
+        self._reader_stop: Optional[threading.Event] = None
+        self._rx = bytearray()
+        self._rx_lock = threading.Lock()
+        self._rx_event = threading.Event()
+        self._watchdog = _ProgressWatchdog()
         self.logger = self._setup_logger()
-        self.communication_log = []  # List to store communication history
+        # Communication history; the oldest entries are dropped once it is full
+        self.communication_log = CommunicationLog(maxlen=config.serial.log_max_entries)
         
         # Setup variables for tracking state
         self.setup_success = False
         self.setup_message = ""
 
-        self.connect(com_port, baud_rate)
+        # Without a port the connection is created unconnected; call connect() later
+        if com_port is not None:
+            self.connect(com_port, baud_rate)
 
         self.com_port = com_port
         self.baud_rate = baud_rate
@@ -47,35 +214,128 @@ class SerialConnection:
     
         
     def connect(self, port: str, baud_rate: int) -> bool:
+        import serial
+        self._stop_reader()
+        # Remembered for try_reconnect
+        self.com_port = port
+        self.baud_rate = baud_rate
         try:
-            if self.serial_conn and self.serial_conn.is_open:
-                self.serial_conn.close()
-                
-            self.serial_conn = serial.Serial(
-                port=port,
-                baudrate=baud_rate
-            )
+            conn = self.serial_conn
+            if conn is not None and getattr(conn, '_is_mock', False):
+                # A simulated device isn't tied to a port; reopening it is all a (re)connect needs
+                if not conn.is_open:
+                    conn.open()
+            elif conn is not None and conn.port == port and conn.baudrate == baud_rate:
+                # Same settings: reopen the existing port instead of constructing a new one
+                if not conn.is_open:
+                    conn.open()
+            else:
+                if conn and conn.is_open:
+                    conn.close()
+                    
+                self.serial_conn = serial.Serial(
+                    port=port,
+                    baudrate=baud_rate,
+                    timeout=config.serial.read_interval,
+                    write_timeout=config.serial.write_timeout
+                )
+                self._last_timeout = self.serial_conn.timeout
+            # Reopening gives the port a new descriptor
+            self._fd = self._native_fd()
+            if config.serial.background_reader:
+                self._start_reader()
            
-            self.logger.info(f"Connected to {port} at {baud_rate} baud")
+            self.logger.info("Connected to %s at %s baud", port, baud_rate)
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to connect: {str(e)}")
+            self._fd = None
+            invalidate_port_cache()
+            self.logger.error("Failed to connect: %s", e)
             return False
 
     def disconnect(self):
+        self._stop_reader()
+        self._fd = None
+        invalidate_port_cache()
         if self.serial_conn and self.serial_conn.is_open:
             self.serial_conn.close()
             self.logger.info("Disconnected from serial device")
 
     
             
+    def _start_reader(self):
+        """Starts the daemon thread that moves incoming bytes from the port into _rx."""
+        with self._rx_lock:
+            self._rx.clear()
+            self._rx_event.clear()
+        self._reader_stop = threading.Event()
+        self._reader = threading.Thread(target=self._reader_loop, args=(self.serial_conn, self._reader_stop),
+                                        name='SerialReader', daemon=True)
+        self._reader.start()
+
+    def _stop_reader(self):
+        """Stops the background reader, if running; it exits within one read timeout."""
+        if self._reader is None:
+            return
+        self._reader_stop.set()
+        self._reader.join(timeout=1.0)
+        self._reader = self._reader_stop = None
+
+    def _reader_loop(self, conn, stop: threading.Event):
+        import serial
+        read = conn.read
+        polled = getattr(conn, '_is_mock', False)
+        read_interval = config.serial.read_interval
+        try:
+            while not stop.is_set():
+                # pyserial blocks for up to the port timeout for the first byte, then takes what is buffered
+                chunk = read(_READ_CHUNK_SIZE) if polled else read(max(1, conn.in_waiting))
+                if chunk:
+                    with self._rx_lock:
+                        self._rx.extend(chunk)
+                        self._rx_event.set()
+                elif polled:
+                    stop.wait(read_interval)
+        except (serial.SerialException, OSError, ValueError, TypeError) as e:
+            if not stop.is_set():
+                self.logger.warning("Background serial reader stopped: %s", e)
+        finally:
+            # Wake a waiting wait_for_response so it notices the reader is gone
+            self._rx_event.set()
+
+    def _set_timeout(self, timeout: Optional[float]):
+        """Apply a read timeout to the port unless it is already in effect."""
+        if timeout != self._last_timeout:
+            self.serial_conn.timeout = timeout
+            self._last_timeout = timeout
+
+    def _native_fd(self) -> Optional[int]:
+        """File descriptor to read the port through directly, or None where serial_conn.read() must be used."""
+        if not sys.platform.startswith('linux'):
+            return None
+        import serial
+        try:
+            fd = self.serial_conn.fileno()
+        except (AttributeError, OSError, ValueError, serial.SerialException):
+            return None
+        return fd if isinstance(fd, int) else None
+
     def is_connected(self) -> bool:
         return self.serial_conn is not None and self.serial_conn.is_open
 
+    def reset_input_buffer(self):
+        """Discards received bytes nobody has read yet, in the driver and in the background reader."""
+        if self._reader is not None:
+            with self._rx_lock:
+                self._rx.clear()
+                self._rx_event.clear()
+        if self.serial_conn is not None:
+            self.serial_conn.reset_input_buffer()
+
     def get_available_ports(self) -> list[str]:
-        """Get list of available COM ports"""
-        return [port.device for port in serial.tools.list_ports.comports()]
+        """Get list of available COM ports, re-enumerating at most every _PORTS_CACHE_TTL_S"""
+        return _available_ports()
 
     def scan_ports(self):
         # If this is a digital twin/mock, return only the mock port name
@@ -83,131 +343,196 @@ class SerialConnection:
            self.serial_conn.__class__.__name__ == 'DigitalTwinSerialDevice':
             return [getattr(self, 'com_port', 'MOCK_COM')]
         # Otherwise, return real ports
-        return [port.device for port in serial.tools.list_ports.comports()]
+        return self.get_available_ports()
 
-    def wait_for_response(self, command_str=None):
+    def wait_for_response(self, timeout=None, log_interval=None, read_interval=None, command_str=None):
         """
         Wait for a response from the serial device with timeout.
         
+        Reads block in the driver until data arrives instead of polling in_waiting
+        and sleeping, so a response is picked up as soon as its first byte lands;
+        the rest is framed by pyserial's read_until. Progress messages come from the
+        connection's watchdog thread, so the read path itself never wakes up just to log.
+        
         Args:
             timeout: Maximum time to wait for a complete response in seconds
             log_interval: Base interval for logging progress in seconds
-            read_interval: Sleep time between read attempts in seconds
+            read_interval: Unit of the idle window; once data has started arriving,
+                no new data for response_idle_threshold * read_interval seconds
+                completes the response
             command_str: The command string being processed (for logging)
             
         Returns:
             tuple: (response_text, is_complete, elapsed_time) where:
                 - response_text is the accumulated response string
-                - is_complete is True if the response ended with CRLF, False otherwise
+                - is_complete is True if the response ended with CRLF or went idle, False otherwise
                 - elapsed_time is the time spent waiting for a response in seconds
         """
         if not self.is_connected():
             return "", False, 0.0
         
         # Use config values if not specified
-        timeout = config.serial.command_timeout
-        base_log_interval = config.serial.log_interval
-        read_interval = config.serial.read_interval
+        serial_config = config.serial
+        timeout = serial_config.command_timeout if timeout is None else timeout
+        base_log_interval = serial_config.log_interval if log_interval is None else log_interval
+        read_interval = serial_config.read_interval if read_interval is None else read_interval
         
         # Initialize variables
         start_time = time.time()
-        response = b""
+        deadline = start_time + timeout
+        # Grown in place; += on bytes would copy the whole response for every chunk
+        response = bytearray()
         is_complete = False
         
         # Progressive logging: first log only after a delay
         wait_log_threshold = 0.5  # Only log waiting message if waiting exceeds 0.5 seconds
         initial_log_posted = False
-        next_log_time = start_time + wait_log_threshold
         log_count = 0
         
-        # Initialize consecutive empty chunks counter
-        consecutive_empty_chunks = 0
-        
-        # Get threshold from config
-        response_idle_threshold = config.serial.response_idle_threshold
-        
-        # Track data reception
-        last_data_time = None
-        
-        while time.time() - start_time < timeout:
-            # Check connection is still valid
-            if not self.is_connected():
-                self.logger.warning("Serial connection lost during response wait")
-                break
+        def log_progress():
+            """Watchdog: logs progress, returning the (growing) delay until it should run again."""
+            nonlocal initial_log_posted, log_count
+            elapsed = time.time() - start_time
+            percent_complete = min(99, (elapsed / timeout) * 100) if timeout > 0 else 99
             
-            # Check if there's data waiting to be read
-            in_waiting = self.serial_conn.in_waiting
-            if in_waiting > 0:
-                # Data available - read it
-                chunk = self.serial_conn.read(in_waiting)
-                response += chunk
-                
-                # Check if response is complete (ends with CRLF)
-                if response.endswith(b'\r\n'):
-                    self.logger.debug(f"Response complete: found CRLF termination")
-                    is_complete = True
-                    break
-                
-                # We got new data, update tracking variables
-                if len(chunk) > 0:
-                    last_data_time = time.time()
-                    consecutive_empty_chunks = 0  # Reset counter when we receive data
-                    
-                    # Log that we received data
-                    self.logger.debug(f"Received {len(chunk)} bytes, total response now {len(response)} bytes")
-            else:
-                # No data in buffer but we've received something previously
-                if last_data_time is not None and len(response) > 0:
-                    consecutive_empty_chunks += 1
-                    
-                    # Log empty chunk counter if it's starting to accumulate
-                    if consecutive_empty_chunks <= response_idle_threshold and consecutive_empty_chunks > 0:
-                        self.logger.debug(f"No new data: empty chunk counter: {consecutive_empty_chunks}/{response_idle_threshold}")
+            # Post initial waiting message only if we've exceeded the threshold
+            if not initial_log_posted and command_str and elapsed >= wait_log_threshold:
+                self.logger.info("⏱️ Waiting for response to: '%s' (timeout: %.1fs)", command_str, timeout)
+                initial_log_posted = True
+            
+            # Only log progress if we have data or if it's been a significant wait
+            should_log = (response or elapsed > 1.0)
+            
+            # Skip building the preview entirely when INFO is filtered out
+            if should_log and initial_log_posted and self.logger.isEnabledFor(logging.INFO):
+                # Format the message differently based on what we've received
+                if response:
+                    # Truncate long responses for cleaner logs, decoding only the bytes shown
+                    preview_bytes = response[:15] + b"..." + response[-15:] if len(response) > 30 else response[:]
+                    response_preview = preview_bytes.decode('ascii', errors='replace').strip()
                     
-                    # Check if we've reached the idle threshold
-                    if consecutive_empty_chunks >= response_idle_threshold:
-                        idle_duration = time.time() - last_data_time
-                        self.logger.debug(f"Response complete: idle threshold reached ({idle_duration:.2f}s since last data)")
-                        is_complete = True
-                        break
+                    # Only log every few seconds after the initial messages
+                    if log_count < 3 or elapsed > 5.0:
+                        self.logger.info("⏱️ Still waiting... %.1fs (%.0f%%) - Received so far: '%s'", elapsed, percent_complete, response_preview)
+                else:
+                    # No data yet - only log occasionally
+                    if log_count < 2 or elapsed > 5.0:
+                        self.logger.info("⏱️ Still waiting... %.1fs (%.0f%%) - No data yet", elapsed, percent_complete)
             
-            # Progressive logging with increasing intervals
-            current_time = time.time()
-            if current_time >= next_log_time:
-                elapsed = current_time - start_time
-                percent_complete = min(99, (elapsed / timeout) * 100)
-                
-                # Post initial waiting message only if we've exceeded the threshold
-                if not initial_log_posted and command_str and elapsed >= wait_log_threshold:
-                    self.logger.info(f"⏱️ Waiting for response to: '{command_str}' (timeout: {timeout:.1f}s)")
-                    initial_log_posted = True
+            # Progressive increase in log interval
+            log_count += 1
+            log_multiplier = min(10, 1 + log_count / 2)  # Gradually increase interval
+            return max(base_log_interval * log_multiplier, wait_log_threshold)
+        
+        # Nothing is ever logged without a command to name, or with INFO filtered out
+        watched = bool(command_str) and self.logger.isEnabledFor(logging.INFO)
+        if watched:
+            self._watchdog.arm(log_progress, wait_log_threshold)
+        
+        import serial
+        
+        # Once data has started arriving, a read that stays empty this long ends the response.
+        # With complete_on_idle off only CRLF ends it, so the window never closes before the deadline.
+        if serial_config.complete_on_idle:
+            idle_timeout = serial_config.response_idle_threshold * read_interval
+        else:
+            idle_timeout = float('inf')
+        
+        # Bind everything the loop touches to locals once
+        conn = self.serial_conn
+        set_timeout = self._set_timeout
+        read = conn.read
+        # Simulated devices (e.g. the digital twin) return from read() at once instead of honouring a timeout
+        polled = getattr(conn, '_is_mock', False)
+        read_until = None if polled else conn.read_until
+        if polled:
+            # The twin can hand over a whole reply per call; other simulated devices are read in chunks
+            poll_read = getattr(conn, 'read_frame', None) or (lambda: read(_READ_CHUNK_SIZE))
+        now = time.time
+        log_debug = self.logger.debug
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        # With the background reader running, bytes are taken from its buffer instead of the port
+        reader = self._reader
+        rx = self._rx
+        rx_lock = self._rx_lock
+        rx_event = self._rx_event
+        # On Linux, wait on the descriptor and read it ourselves instead of going through pyserial
+        fd = self._fd if reader is None else None
+        if fd is not None:
+            fds = [fd]
+            select_fd = select.select
+            os_read = os.read
+        
+        try:
+            while True:
+                remaining = deadline - now()
+                if remaining <= 0:
+                    break
                 
-                # Only log progress if we have data or if it's been a significant wait
-                should_log = (response or elapsed > 1.0)
+                # Until data starts arriving wait out the deadline, afterwards only the idle window
+                read_timeout = min(remaining, idle_timeout) if response else remaining
                 
-                if should_log and initial_log_posted:
-                    # Format the message differently based on what we've received
-                    if response:
-                        response_preview = response.decode('ascii', errors='replace').strip()
-                        # Truncate long responses for cleaner logs
-                        if len(response_preview) > 30:
-                            response_preview = response_preview[:15] + "..." + response_preview[-15:]
-                        
-                        # Only log every few seconds after the initial messages
-                        if log_count < 3 or elapsed > 5.0:
-                            self.logger.info(f"⏱️ Still waiting... {elapsed:.1f}s ({percent_complete:.0f}%) - Received so far: '{response_preview}'")
+                # A port that drops mid-wait shows up as an error from the read itself
+                try:
+                    if reader is not None:
+                        rx_event.wait(read_timeout)
+                        with rx_lock:
+                            chunk = bytes(rx)
+                            rx.clear()
+                            rx_event.clear()
+                        if not chunk and not reader.is_alive():
+                            raise serial.SerialException("background reader stopped")
+                    elif fd is not None:
+                        if not select_fd(fds, (), (), read_timeout)[0]:
+                            chunk = b''
+                        else:
+                            try:
+                                chunk = os_read(fd, _READ_CHUNK_SIZE)
+                            except BlockingIOError:
+                                continue
+                            if not chunk:
+                                # Readable but empty means the device went away
+                                raise serial.SerialException("device reports readiness to read but returned no data")
+                    elif polled:
+                        # Poll the simulated device for up to read_timeout
+                        poll_deadline = now() + read_timeout
+                        while not (chunk := poll_read()) and now() < poll_deadline:
+                            time.sleep(read_interval)
+                    elif response:
+                        # Let pyserial frame the rest. The port timeout bounds the whole read_until
+                        # call, not each byte: it returns whatever arrived within one idle window
+                        set_timeout(read_timeout)
+                        chunk = read_until(CRLF)
                     else:
-                        # No data yet - only log occasionally
-                        if log_count < 2 or elapsed > 5.0:
-                            self.logger.info(f"⏱️ Still waiting... {elapsed:.1f}s ({percent_complete:.0f}%) - No data yet")
+                        # Block until the first byte arrives or the deadline passes
+                        set_timeout(read_timeout)
+                        chunk = read(1)
+                except (serial.SerialException, OSError, ValueError) as e:
+                    self.logger.warning("Serial connection lost during response wait: %s", e)
+                    break
                 
-                # Progressive increase in log interval
-                log_count += 1
-                log_multiplier = min(10, 1 + log_count / 2)  # Gradually increase interval
-                next_log_time = current_time + (base_log_interval * log_multiplier)
-            
-            # Sleep to avoid CPU hogging
-            time.sleep(read_interval)
+                if chunk:
+                    response.extend(chunk)
+                    
+                    # Check if response is complete (ends with CRLF)
+                    if response.endswith(CRLF):
+                        if debug_enabled:
+                            log_debug("Response complete: found CRLF termination")
+                        is_complete = True
+                        break
+                    
+                    # Log that we received data
+                    if debug_enabled:
+                        log_debug("Received %d bytes, total response now %d bytes", len(chunk), len(response))
+                elif response and read_timeout == idle_timeout:
+                    # Data arrived earlier but nothing new for the whole idle window
+                    if debug_enabled:
+                        log_debug("Response complete: idle threshold reached (%.2fs since last data)", idle_timeout)
+                    is_complete = True
+                    break
+        finally:
+            if watched:
+                self._watchdog.disarm()
         
         # Decode the response
         response_text = ""
@@ -216,17 +541,17 @@ class SerialConnection:
                 response_text = response.decode('ascii').strip()
             except UnicodeDecodeError:
                 # Return hex representation if not ASCII
-                response_text = f"Non-ASCII response: {[hex(b) for b in response]}"
+                response_text = f"Non-ASCII response: {response.hex(' ')}"
         
         # Check if we timed out
         elapsed_time = time.time() - start_time
         if not is_complete and elapsed_time >= timeout:
-            self.logger.warning(f"Response timeout after {elapsed_time:.2f}s")
+            self.logger.warning("Response timeout after %.2fs", elapsed_time)
             
         return response_text, is_complete, elapsed_time
 
     def try_reconnect(self) -> bool:
-        self.logger.info(f"Attempting reconnection to {self.com_port} at {self.baud_rate} baud...")
+        self.logger.info("Attempting reconnection to %s at %s baud...", self.com_port, self.baud_rate)
         
         # Disconnect first if needed
         if self.serial_conn and self.serial_conn.is_open:
@@ -237,7 +562,7 @@ class SerialConnection:
         
         return self.connect(self.com_port, self.baud_rate)
 
-    def send_command_and_with_response_polling(self, cmd_str: str, row: int, col: int) -> str:
+    def send_command_and_with_response_polling(self, cmd_str: str | bytes, row: int, col: int, drain: bool = False) -> str:
         """
         Send a command to the serial device and wait for response with timeout handling.
         
@@ -245,9 +570,11 @@ class SerialConnection:
         with configurable timeout and retry logic.
         
         Args:
-            cmd_str: The command string to send
+            cmd_str: The command string to send, or its ASCII bytes
             row: Row index (0-based) of the command in the data array (for logging)
             col: Column index (0-based) of the command in the data array (for logging)
+            drain: Block until the command has left the output buffer before waiting
+                for the response. Not needed normally, the response confirms transmission
             
         Returns:
             str: The response from the device, or an error message
@@ -256,89 +583,104 @@ class SerialConnection:
             RuntimeError: If on_no_response_action is "stop" and no valid response is received
         """
         # Validate command format
-        if not isinstance(cmd_str, str):
-            self.logger.warning(f"Invalid command type: {type(cmd_str)}, expected string")
+        if not isinstance(cmd_str, (str, bytes)):
+            self.logger.warning("Invalid command type: %s, expected string", type(cmd_str))
             return f"ERROR: Command must be a string, got {type(cmd_str)}"
         
         if cmd_str:
-            self.logger.debug(f"Command string: '{cmd_str}', Length: {len(cmd_str)}, Repr: {repr(cmd_str)}")
+            self.logger.debug("Command string: '%s', Length: %d, Repr: %r", cmd_str, len(cmd_str), cmd_str)
         
-        if not cmd_str.strip():
-            self.logger.debug(f"Skipping command with only whitespace: Repr: {repr(cmd_str)}")
+        if isinstance(cmd_str, bytes):
+            # Already encoded (e.g. SerialDeviceController's templates); text is only kept for logs
+            stripped_bytes = cmd_str.strip()
+            stripped = stripped_bytes.decode('ascii', errors='replace')
+        else:
+            stripped = cmd_str.strip()
+            stripped_bytes = None
+        if not stripped:
+            self.logger.debug("Skipping command with only whitespace: Repr: %r", cmd_str)
             return ""
         
-        if not cmd_str.startswith(":"):
-            self.logger.info(f"Skipping: {cmd_str} (does not start with ':')")
+        if stripped[0] != ":":
+            self.logger.info("Skipping: %s (does not start with ':')", stripped)
             return ""
         
-        command = cmd_str if cmd_str.endswith('\r\n') else cmd_str + '\r\n'
-        
-        # Get configuration parameters
-        max_attempts = config.serial.max_attempts
-        base_command_timeout = config.serial.command_timeout
-        log_interval = config.serial.log_interval
-        read_interval = config.serial.read_interval
+        # Encoded once; retries write the same bytes
+        if stripped_bytes is None:
+            command_bytes = _wire(stripped)
+        else:
+            command_bytes = stripped_bytes + CRLF
+        
+        # Snapshot configuration parameters for the whole retry loop
+        serial_config = config.serial
+        max_attempts = serial_config.command_retry_count
+        log_interval = serial_config.log_interval
+        read_interval = serial_config.read_interval
+        reconnect_delay = serial_config.reconnect_delay
+        on_no_response = serial_config.on_no_response_action
+        # Each retry waits four times longer than the previous attempt
+        timeouts = [serial_config.command_timeout * (4 ** i) for i in range(max_attempts)]
         
         # Use position-based ID with 1-based indices for commands position in the data array
         command_id = f"CMD-R{row+1}C{col+1}"
+        info_enabled = self.logger.isEnabledFor(logging.INFO)
         
         # Try sending the command with multiple attempts if necessary
         for attempt in range(1, max_attempts + 1):
-            current_timeout = base_command_timeout * (4 ** (attempt - 1))
+            current_timeout = timeouts[attempt - 1]
             
-            self.logger.info(f"[{command_id}] ► SENDING '{cmd_str.strip()}' (timeout: {current_timeout:.1f}s, attempt: {attempt}/{max_attempts})")
+            if info_enabled:
+                self.logger.info("[%s] ► SENDING '%s' (timeout: %.1fs, attempt: %d/%d)",
+                                 command_id, stripped, current_timeout, attempt, max_attempts)
             
-            command_bytes = command.encode('ascii')
+            if self._reader is not None:
+                # Whatever the reader holds now (late replies, line noise) predates this command
+                with self._rx_lock:
+                    self._rx.clear()
+                    self._rx_event.clear()
             self.serial_conn.write(command_bytes)
-            self.serial_conn.flush()  # Ensure data is sent immediately
-            send_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            if drain:
+                self.serial_conn.flush()
+            # Kept as an int; format_log_timestamp renders it when the log is displayed
+            send_time_ns = time.time_ns()
             
             response, is_complete, elapsed_time = self.wait_for_response(
                 timeout=current_timeout,  # Use the increased timeout
                 log_interval=log_interval,
                 read_interval=read_interval,
-                command_str=cmd_str.strip()  # Pass command for better logging
+                command_str=stripped  # Pass command for better logging
             )
             
             if is_complete:
                 # Success - complete response received
-                response_log_text = response if len(response) <= 20 else response[:10] + "..." + response[-10:]
-                
-                self.logger.info(f"[{command_id}] ✓ COMPLETE: '{cmd_str.strip()}' → '{response_log_text}' (Time: {elapsed_time:.2f}s, Attempt: {attempt}/{max_attempts})")
+                if info_enabled:
+                    response_log_text = response if len(response) <= 20 else response[:10] + "..." + response[-10:]
+                    self.logger.info("[%s] ✓ COMPLETE: '%s' → '%s' (Time: %.2fs, Attempt: %d/%d)",
+                                     command_id, stripped, response_log_text, elapsed_time, attempt, max_attempts)
                 
                 # Add to communication log
-                self.communication_log.append({
-                    'timestamp': send_time,
-                    'sent': cmd_str.strip(),
-                    'received': response,
-                    'success': True
-                })
+                self.communication_log.append(send_time_ns, stripped, response, True)
                 
                 return response
             
             else:
                 # No response received
-                self.logger.warning(f"[{command_id}] ⚠ NO RESPONSE after {elapsed_time:.2f}s")
+                self.logger.warning("[%s] ⚠ NO RESPONSE after %.2fs", command_id, elapsed_time)
                 
                 # Add to communication log as timeout
-                self.communication_log.append({
-                    'timestamp': send_time,
-                    'sent': cmd_str.strip(),
-                    'received': "TIMEOUT: No response",
-                    'success': False
-                })
+                self.communication_log.append(send_time_ns, stripped, "TIMEOUT: No response", False)
                 
                 if attempt < max_attempts:
-                    self.logger.info(f"[{command_id}] Retrying command (attempt {attempt+1}/{max_attempts})...")
+                    self.logger.info("[%s] Retrying command (attempt %d/%d)...", command_id, attempt + 1, max_attempts)
                 else:
                     # No response on final attempt
-                    self.logger.error(f"[{command_id}] ✗ FAILED: No response after {max_attempts} attempts")
+                    self.logger.error("[%s] ✗ FAILED: No response after %d attempts", command_id, max_attempts)
                     no_response_msg = f"NO RESPONSE AFTER {max_attempts} ATTEMPTS"
-                    if config.serial.on_no_response_action == "stop":
+                    if on_no_response == "stop":
                         raise RuntimeError(f"Command '{cmd_str}': {no_response_msg}")
                     return no_response_msg
             
-            time.sleep(config.serial.reconnect_delay)    
+            time.sleep(reconnect_delay)
             if self.try_reconnect():
                 continue
                         
@@ -353,6 +695,12 @@ class SerialDeviceController:
         ports = controller.scan_ports()  # For UI dropdown
         controller.connect(selected_port, selected_baud_rate)
     """
+    # Command templates, formatted with bytes % so nothing needs encoding per call
+    _CMD_READ_SIGNAL = b':02%X%X'        # channel, signal type
+    _CMD_WRITE_SIGNAL = b':04%X%X%08X'   # channel, signal type, value
+    _CMD_MEASURE = b':07%02X'            # channel
+    _CMD_TOGGLE_LED = b':080%X%08X'      # channel, state
+
     def __init__(self, serial_config):
         self.serial_config = serial_config
         self.serial_conn = None
@@ -364,44 +712,47 @@ class SerialDeviceController:
         if getattr(self.serial_config, 'use_mock_device', False):
             return [getattr(self.serial_config, 'mock_port_name', 'MOCK_COM')]
         # Otherwise, return real ports
-        import serial.tools.list_ports
-        return [port.device for port in serial.tools.list_ports.comports()]
+        return _available_ports()
 
     def connect(self, port, baud_rate=115200):
         """Create and open a connection to the given port (real or mock)."""
         # Disconnect any existing connection
-        if self.serial_conn:
-            try:
-                self.serial_conn.close()
-            except Exception:
-                pass
+        self.disconnect()
+        conn = SerialConnection()
         if getattr(self.serial_config, 'use_mock_device', False):
             from serial_comm.digital_twin import DigitalTwinSerialDevice
-            self.serial_conn = DigitalTwinSerialDevice(min_delay=0.05, max_delay=0.2)
-            self.serial_conn.is_open = True
-        else:
-            import serial
-            self.serial_conn = serial.Serial(
-                port=port,
-                baudrate=baud_rate,
-                timeout=getattr(self.serial_config, 'timeout', 1.0)
-            )
+            # SerialConnection polls the twin like a port and reopens it on reconnect
+            conn.serial_conn = DigitalTwinSerialDevice(min_delay=0.05, max_delay=0.2)
+        if not conn.connect(port, baud_rate):
+            return False
+        self.serial_conn = conn
         self.connected_port = port
         self.connected_baud = baud_rate
         return True
 
+    def disconnect(self):
+        if self.serial_conn:
+            try:
+                self.serial_conn.disconnect()
+            except Exception:
+                pass
+        self.serial_conn = None
+
+    def is_connected(self) -> bool:
+        return self.serial_conn is not None and self.serial_conn.is_connected()
+
+    def _send(self, command: bytes, channel: int) -> str:
+        # SerialConnection uses row/col only to label log lines; the channel is the useful one here
+        return self.serial_conn.send_command_and_with_response_polling(command, 0, channel)
+
     def _handshake_successful(self):
-        self.serial_conn.flushInput()
-        self.serial_conn.flushOutput()
-            
+        # A late reply to an earlier command must not be taken for the handshake answer
+        self.serial_conn.reset_input_buffer()
         # Check if device responds correctly
-        self.serial_conn.write(b':00\r')
-        response = self.serial_conn.read(10)
-        
-        return response == b':55555555\r'
+        return self._send(b':00', 0) == _HANDSHAKE_REPLY
     
     def _is_ready(self):
-        return self.serial_conn.is_connected() and self._handshake_successful()
+        return self.is_connected() and self._handshake_successful()
 
     def read_signal_from_channel(self, channel: int, signal_type: int) -> int:
         """
@@ -423,17 +774,20 @@ class SerialDeviceController:
             raise SerialCommunicationError("Device not connected")
             
         # Command format: ':02CS\r' where C is channel, S is signal type
-        command = f':02{channel:1X}{signal_type:1X}'
+        command = self._CMD_READ_SIGNAL % (channel, signal_type)
         
-        response = self.serial_conn.send_command_and_with_response_polling(command)
+        response = self._send(command, channel)
         
-        # Response format: ':03CSxxxxxxxx\r'
-        # Extract the value (last 8 hex characters before \r)
-        if len(response) != 14:
-            raise SerialCommunicationError(f"Invalid response length: {len(response)}")
+        # Response format: ':03CSxxxxxxxx', the value being the 8 hex digits after C and S
+        if len(response) != _SIGNAL_LENGTH or not response.startswith(_SIGNAL_PREFIX):
+            raise SerialCommunicationError(f"Invalid response: {response!r}")
             
+        value = response[_SIGNAL_VALUE]
+        # bytes.fromhex skips whitespace, so ' ' inside the field has to be rejected first
+        if not value.isalnum():
+            raise SerialCommunicationError(f"Invalid response format: {response}")
         try:
-            return int(response[-9:-1], 16)
+            return int.from_bytes(bytes.fromhex(value), 'big')
         except ValueError:
             raise SerialCommunicationError(f"Invalid response format: {response}")
     
@@ -453,12 +807,12 @@ class SerialDeviceController:
             raise SerialCommunicationError("Device not connected")
             
         # Command format: ':04CSxxxxxxxx\r' where C is channel, S is signal type
-        command = f':04{channel:1X}{signal_type:1X}{value:08X}'
+        command = self._CMD_WRITE_SIGNAL % (channel, signal_type, value)
         
-        response = self.serial_conn.send_command_and_with_response_polling(command)
+        response = self._send(command, channel)
         
-        # Check if write was successful (response should be ':00\r')
-        return response == b':00\r'
+        # Check if write was successful (response should be ':00')
+        return response == _ACK
     
     def measure_channel(self, channel: int) -> Tuple[int, int, int]:
         """
@@ -474,21 +828,23 @@ class SerialDeviceController:
             raise SerialCommunicationError("Device not connected")
             
         # Command format: ':07xx\r' where xx is the channel number in hex
-        command = f':07{channel:02X}'
+        command = self._CMD_MEASURE % channel
         
-        response = self.serial_conn.send_command_and_with_response_polling(command)
+        response = self._send(command, channel)
         
-        # Response format: ':08xxyyyyzzzzwwww\r'
+        # Response format: ':08xxyyyyzzzzwwww'
         # where xx is channel, yyyy is adc1, zzzz is adc2, wwww is background
-        if len(response) != 18:
-            raise SerialCommunicationError(f"Invalid response length: {len(response)}")
+        if len(response) != _MEASURE_LENGTH or not response.startswith(_MEASURE_PREFIX):
+            raise SerialCommunicationError(f"Invalid response: {response!r}")
             
+        values = response[_MEASURE_VALUES]
+        # bytes.fromhex skips whitespace, so ' ' inside the fields has to be rejected first
+        if not values.isalnum():
+            raise SerialCommunicationError(f"Invalid response format: {response}")
         try:
-            adc_pulse = int(response[5:9], 16)
-            adc2_pulse = int(response[9:13], 16)
-            adc_background = int(response[13:17], 16)
-            return (adc_pulse, adc2_pulse, adc_background)
-        except ValueError:
+            # One C-level unpack for all three 4-digit hex fields
+            return _ADC_READINGS.unpack(bytes.fromhex(values))
+        except (ValueError, struct.error):
             raise SerialCommunicationError(f"Invalid response format: {response}")
     
     def toggle_led(self, channel: int, state: int) -> bool:
@@ -506,9 +862,9 @@ class SerialDeviceController:
             raise SerialCommunicationError("Device not connected")
             
         # Command format: ':080Cxxxxxxxx\r' where C is channel
-        command = f':080{channel:X}{state:08X}'
+        command = self._CMD_TOGGLE_LED % (channel, state)
         
-        response = self.serial_conn.send_command_and_with_response_polling(command)
+        response = self._send(command, channel)
         
-        # Check if toggle was successful (response should be ':00\r')
-        return response == b':00\r'
+        # Check if toggle was successful (response should be ':00')
+        return response == _ACK
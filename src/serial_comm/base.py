@@ -10,8 +10,14 @@ class SerialPort(Protocol):
     def send(self, data: bytes) -> None:
         ...
 
+    def flush(self) -> None:
+        ...
+
     def receive(self, timeout: float = 1.0) -> bytes:
         ...
 
+    def receive_until(self, terminator: bytes, timeout: float = 1.0) -> bytes:
+        ...
+
     def is_connected(self) -> bool:
         ... 
\ No newline at end of file
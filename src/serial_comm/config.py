@@ -11,4 +11,5 @@ class SerialConfig:
     reconnect_delay: float = 1.0  # seconds
     log_level: str = "INFO"
     response_terminator: bytes = b"\r\n"
+    max_frame_size: int = 4096  # initial size of the receive buffer; grown if a frame needs more
     response_idle_threshold: int = 5  # number of empty reads before considering response done 
\ No newline at end of file
@@ -1,17 +1,54 @@
 import random
 import time
+from collections import deque
 from typing import Optional
 
+# Consumed output bytes are deleted from the front of the buffer once this many have been read
+_COMPACT_THRESHOLD = 4096
+
+_ACK = b":00\r"
+_UNKNOWN = b":FF\r"
+
+# Commands whose reply never changes: exact matches, then 3- or 4-byte prefixes
+_STATIC_RESPONSES = {b":00": b":55555555\r"}
+_PREFIX_RESPONSES = {b":04": _ACK, b":080": _ACK}
+
+# Simulated delays shorter than this only yield the GIL instead of sleeping; OS sleep
+# granularity (~15 ms on Windows) would stretch them far past what was asked for
+_YIELD_THRESHOLD = 0.001
+
+# Random readings are drawn this many at a time and handed out one per command
+_POOL_SIZE = 4096
+# Hex of the signal values the twin reports (-1, 0 or 1, as 32-bit two's complement)
+_SIGNAL_HEX = tuple(b"%08X" % (value & 0xFFFFFFFF) for value in (-1, 0, 1))
+
 class DigitalTwinSerialDevice:
+    # read() never blocks; SerialConnection polls devices marked like this
+    _is_mock = True
+
     def __init__(self, min_delay: float = 0.0, max_delay: float = 0.0):
         """
         min_delay, max_delay: range of random delay (in seconds) to simulate device processing time
         """
-        self.input_buffer = b""
-        self.output_buffer = b""
+        self.input_buffer = bytearray()
+        self.output_buffer = bytearray()
+        # Read position in output_buffer; consumed bytes are only dropped once enough pile up
+        self._out_pos = 0
+        # Replies not yet read, one complete frame each; read() moves them into output_buffer
+        self._frames = deque()
         self.min_delay = min_delay
         self.max_delay = max_delay
         self.is_open = True  # Always open for the mock
+        # Pools of pre-drawn random values, refilled when empty
+        # ADC readings kept as one run of uppercase hex, 12 characters (three uint16s) per response
+        self._adc_hex = b""
+        self._adc_pos = 0
+        self._signal_pool = []
+        # Only replies carrying readings need building; everything else is in the tables above
+        self._handlers = {
+            b":02": self._h_signal,
+            b":07": self._h_adc,
+        }
 
     def open(self):
         self.is_open = True
@@ -20,47 +57,79 @@ class DigitalTwinSerialDevice:
         self.is_open = False
 
     def write(self, data: bytes):
-        self.input_buffer += data
+        self.input_buffer.extend(data)
         self._process_command(data)
 
     def read(self, size: int) -> bytes:
-        if len(self.output_buffer) == 0:
+        if self._frames:
+            self.output_buffer.extend(b"".join(self._frames))
+            self._frames.clear()
+        pos = self._out_pos
+        if pos >= len(self.output_buffer):
             return b""
-        to_return = self.output_buffer[:size]
-        self.output_buffer = self.output_buffer[size:]
+        to_return = bytes(self.output_buffer[pos:pos + size])
+        pos += len(to_return)
+        if pos >= _COMPACT_THRESHOLD:
+            del self.output_buffer[:pos]
+            pos = 0
+        self._out_pos = pos
         return to_return
 
+    def read_frame(self) -> bytes:
+        """Returns the oldest whole reply (CR-terminated) in one call, or b"" if none is waiting."""
+        pos = self._out_pos
+        if pos < len(self.output_buffer):
+            # Finish the reply a previous read() stopped partway through
+            end = self.output_buffer.find(b"\r", pos)
+            end = len(self.output_buffer) if end == -1 else end + 1
+            frame = bytes(self.output_buffer[pos:end])
+            if end >= len(self.output_buffer):
+                self.output_buffer.clear()
+                end = 0
+            self._out_pos = end
+            return frame
+        return self._frames.popleft() if self._frames else b""
+
+    def reset_input_buffer(self):
+        # pyserial's name, seen from the host: drop replies that haven't been read
+        self.flushOutput()
+
     def flushInput(self):
-        self.input_buffer = b""
+        self.input_buffer.clear()
 
     def flushOutput(self):
-        self.output_buffer = b""
+        self.output_buffer.clear()
+        self._out_pos = 0
+        self._frames.clear()
 
     def _process_command(self, data: bytes):
         # Simulate processing delay
         if self.max_delay > 0:
             delay = random.uniform(self.min_delay, self.max_delay)
-            time.sleep(delay)
-        cmd = data.decode("ascii").strip()
-        if cmd == ":00":
-            self.output_buffer += b":55555555\r"
-        elif cmd.startswith(":02"):
-            channel = cmd[3]
-            signal_type = cmd[4]
-            value = random.randint(-1, 1)
-            value_hex = f"{value & 0xFFFFFFFF:08X}"
-            response = f":03{channel}{signal_type}{value_hex}\r".encode("ascii")
-            self.output_buffer += response
-        elif cmd.startswith(":07"):
-            channel = cmd[3:5]
-            adc1 = random.randint(0, 65535)
-            adc2 = random.randint(0, 65535)
-            bg = random.randint(0, 65535)
-            response = f":08{channel}{adc1:04X}{adc2:04X}{bg:04X}\r".encode("ascii")
-            self.output_buffer += response
-        elif cmd.startswith(":04"):
-            self.output_buffer += b":00\r"
-        elif cmd.startswith(":080"):
-            self.output_buffer += b":00\r"
-        else:
-            self.output_buffer += b":FF\r" 
\ No newline at end of file
+            # sleep(0) lets the reader thread and the UI run without pinning a core
+            time.sleep(0 if delay < _YIELD_THRESHOLD else delay)
+        cmd = bytes(data).strip()
+        response = (_STATIC_RESPONSES.get(cmd)
+                    or _PREFIX_RESPONSES.get(cmd[:3])
+                    or _PREFIX_RESPONSES.get(cmd[:4]))
+        if response is None:
+            # The first three bytes (':' + opcode) pick the handler; unknown commands get :FF
+            handler = self._handlers.get(cmd[:3])
+            response = handler(cmd) if handler else _UNKNOWN
+        self._frames.append(response)
+
+    def _h_signal(self, cmd: bytes) -> bytes:
+        # Echo channel and signal type (cmd[3:5]) followed by the value
+        pool = self._signal_pool
+        if not pool:
+            pool.extend(random.choices(_SIGNAL_HEX, k=_POOL_SIZE))
+        return b":03" + cmd[3:5] + pool.pop() + b"\r"
+
+    def _h_adc(self, cmd: bytes) -> bytes:
+        pos = self._adc_pos
+        if pos >= len(self._adc_hex):
+            # Random bytes are big-endian uint16s already; one hex() call formats the whole batch
+            self._adc_hex = random.randbytes(6 * _POOL_SIZE).hex().upper().encode('ascii')
+            pos = 0
+        self._adc_pos = pos + 12
+        return b":08" + cmd[3:5] + self._adc_hex[pos:pos + 12] + b"\r"
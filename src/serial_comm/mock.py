@@ -1,10 +1,11 @@
-from typing import List, Optional
+from collections import deque
+from typing import Deque, List, Optional
 from .base import SerialPort
 
 class MockSerialPort:
     def __init__(self):
         self.sent_data: List[bytes] = []
-        self.response_queue: List[bytes] = []
+        self.response_queue: Deque[bytes] = deque()
         self.connected = False
 
     def connect(self) -> None:
@@ -18,12 +19,31 @@ class MockSerialPort:
             raise RuntimeError("MockSerialPort not connected")
         self.sent_data.append(data)
 
+    def flush(self) -> None:
+        if not self.connected:
+            raise RuntimeError("MockSerialPort not connected")
+
     def receive(self, timeout: float = 1.0) -> bytes:
         if not self.connected:
             raise RuntimeError("MockSerialPort not connected")
-        if self.response_queue:
-            return self.response_queue.pop(0)
-        return b''
+        return self.response_queue.popleft() if self.response_queue else b''
+
+    def receive_until(self, terminator: bytes, timeout: float = 1.0) -> bytes:
+        if not self.connected:
+            raise RuntimeError("MockSerialPort not connected")
+        data = bytearray()
+        while self.response_queue:
+            # Only the new chunk (plus a possible split terminator) needs searching
+            scan_from = max(0, len(data) - len(terminator) + 1)
+            data.extend(self.response_queue.popleft())
+            idx = data.find(terminator, scan_from)
+            if idx != -1:
+                end = idx + len(terminator)
+                if end < len(data):
+                    # Coalesced frames: hand the rest out on the next receive
+                    self.response_queue.appendleft(bytes(data[end:]))
+                return bytes(data[:end])
+        return bytes(data)
 
     def is_connected(self) -> bool:
         return self.connected
@@ -1,6 +1,5 @@
 from .base import SerialPort
 from .exceptions import SerialTimeoutError
-import time
 
 def send_command_and_wait_for_response(
     port: SerialPort,
@@ -11,18 +10,13 @@ def send_command_and_wait_for_response(
 ) -> bytes:
     """
     Send a command and wait for a response ending with the given terminator.
-    Retries up to max_attempts on timeout.
+    Retries up to max_attempts on timeout. The wait itself happens in the port's
+    receive_until, so there is no polling here.
     """
     for attempt in range(max_attempts):
         port.send(command)
-        start = time.time()
-        response = b""
-        while time.time() - start < timeout:
-            chunk = port.receive(timeout=timeout)
-            response += chunk
-            if response.endswith(response_terminator):
-                return response
-            if not chunk:
-                time.sleep(0.01)
+        response = port.receive_until(response_terminator, timeout=timeout)
+        if response.endswith(response_terminator):
+            return response
         # If we get here, timeout
     raise SerialTimeoutError(f"No response after {max_attempts} attempts and {timeout} seconds per attempt.") 
\ No newline at end of file
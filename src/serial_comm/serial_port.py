@@ -1,17 +1,39 @@
 import serial
 import logging
+import time
 from .base import SerialPort
 from .config import SerialConfig
-from .exceptions import SerialConnectionError, SerialTimeoutError
+from .exceptions import SerialCommunicationError, SerialConnectionError, SerialTimeoutError
+
+_LOG = logging.getLogger("serial_comm.PySerialPort")
+
+# Whether per-I/O debug lines are emitted; checked instead of walking the logger hierarchy on every call
+_DEBUG_ENABLED = False
+
+def configure_debug(enabled: bool) -> None:
+    """
+    Turns per-send/receive debug logging on or off for every PySerialPort. Call it from your
+    logging setup, and again whenever logging levels change; creating a port doesn't touch it.
+    """
+    global _DEBUG_ENABLED
+    _DEBUG_ENABLED = enabled
 
 class PySerialPort:
     def __init__(self, config: SerialConfig):
         self.config = config
         self.serial = None
-        self.logger = logging.getLogger("serial_comm.PySerialPort")
+        # Receive buffer allocated once and read into directly; the first _rx_len bytes are
+        # data read past the last terminator, kept for the next receive
+        self._rx_buf = bytearray(config.max_frame_size)
+        self._rx_mv = memoryview(self._rx_buf)
+        self._rx_len = 0
+        # Last timeout handed to pyserial; setting it reconfigures the driver (SetCommTimeouts on Windows)
+        self._applied_timeout = None
+        self.logger = _LOG
         self.logger.setLevel(getattr(logging, config.log_level.upper(), logging.INFO))
 
     def connect(self) -> None:
+        self._rx_len = 0
         try:
             self.serial = serial.Serial(
                 port=self.config.port,
@@ -19,13 +41,21 @@ class PySerialPort:
                 timeout=self.config.timeout,
                 write_timeout=self.config.write_timeout
             )
-            self.logger.info(f"Connected to {self.config.port} at {self.config.baudrate} baud")
+            self._applied_timeout = self.config.timeout
+            self.logger.info("Connected to %s at %s baud", self.config.port, self.config.baudrate)
         except Exception as e:
-            self.logger.error(f"Failed to connect: {e}")
+            self.logger.error("Failed to connect: %s", e)
             raise SerialConnectionError(str(e))
 
     def disconnect(self) -> None:
+        self._rx_len = 0
+        self._applied_timeout = None
         if self.serial and self.serial.is_open:
+            # Sends don't wait for the transmit buffer, so drain it before closing
+            try:
+                self.serial.flush()
+            except Exception as e:
+                self.logger.warning("Flush before disconnect failed: %s", e)
             self.serial.close()
             self.logger.info("Disconnected from serial port")
 
@@ -34,26 +64,108 @@ class PySerialPort:
             raise SerialConnectionError("Not connected to serial port")
         try:
             self.serial.write(data)
+            if _DEBUG_ENABLED:
+                self.logger.debug("Sent: %r", data)
+        except Exception as e:
+            self.logger.error("Send failed: %s", e)
+            raise SerialCommunicationError(str(e))
+
+    def flush(self) -> None:
+        """Blocks until everything sent has left the transmit buffer."""
+        if not self.is_connected():
+            raise SerialConnectionError("Not connected to serial port")
+        try:
             self.serial.flush()
-            self.logger.debug(f"Sent: {data!r}")
         except Exception as e:
-            self.logger.error(f"Send failed: {e}")
+            self.logger.error("Flush failed: %s", e)
             raise SerialCommunicationError(str(e))
 
     def receive(self, timeout: float = None) -> bytes:
         if not self.is_connected():
             raise SerialConnectionError("Not connected to serial port")
         timeout = timeout if timeout is not None else self.config.timeout
-        self.serial.timeout = timeout
         try:
-            data = self.serial.read_until(self.config.response_terminator)
-            if not data:
-                raise SerialTimeoutError(f"No response within {timeout} seconds")
-            self.logger.debug(f"Received: {data!r}")
-            return data
+            data = self._read_until(self.config.response_terminator, timeout)
         except Exception as e:
-            self.logger.error(f"Receive failed: {e}")
+            self.logger.error("Receive failed: %s", e)
             raise SerialCommunicationError(str(e))
+        if not data:
+            raise SerialTimeoutError(f"No response within {timeout} seconds")
+        if _DEBUG_ENABLED:
+            self.logger.debug("Received: %r", data)
+        return data
+
+    def receive_until(self, terminator: bytes, timeout: float = None) -> bytes:
+        """Reads until terminator or timeout; returns whatever arrived, possibly incomplete."""
+        if not self.is_connected():
+            raise SerialConnectionError("Not connected to serial port")
+        timeout = timeout if timeout is not None else self.config.timeout
+        try:
+            data = self._read_until(terminator, timeout)
+        except Exception as e:
+            self.logger.error("Receive failed: %s", e)
+            raise SerialCommunicationError(str(e))
+        if _DEBUG_ENABLED:
+            self.logger.debug("Received: %r", data)
+        return data
+
+    def _read_until(self, terminator: bytes, timeout: float) -> bytes:
+        """
+        Returns everything up to and including terminator, or what arrived before the timeout.
+        Reads whatever the driver has buffered straight into self._rx_buf and frames it there,
+        blocking only while nothing is waiting; bytes past the terminator stay in the buffer.
+        """
+        # Bound once: the loop below runs per chunk and these don't change during a call
+        ser = self.serial
+        buf = self._rx_buf
+        mv = self._rx_mv
+        monotonic = time.monotonic
+        fill = self._rx_len
+        term_len = len(terminator)
+        idx = buf.find(terminator, 0, fill)
+        deadline = monotonic() + timeout
+        first_wait = True
+        while idx == -1:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                break
+            n = ser.in_waiting
+            if not n:
+                # Nothing buffered: block for the first byte, at most until the deadline.
+                # The first wait uses the caller's timeout as is, so repeated receives with the
+                # same timeout leave the driver alone; later waits are trimmed to the deadline.
+                self._apply_timeout(timeout if first_wait else remaining)
+                first_wait = False
+                n = 1
+            if fill + n > len(buf):
+                # A frame longer than the buffer: grow it (rare, so doubling is fine)
+                mv.release()
+                buf.extend(bytes(max(len(buf), fill + n - len(buf))))
+                mv = self._rx_mv = memoryview(buf)
+            got = ser.readinto(mv[fill:fill + n])
+            if not got:
+                break
+            # Only the new bytes (plus a possible split terminator) need searching
+            start = max(0, fill - term_len + 1)
+            fill += got
+            idx = buf.find(terminator, start, fill)
+        if idx == -1:
+            data = bytes(mv[:fill])
+            self._rx_len = 0
+        else:
+            end = idx + term_len
+            data = bytes(mv[:end])
+            # Move the leftover (usually nothing) to the front for the next receive
+            rest = fill - end
+            if rest:
+                mv[:rest] = mv[end:fill]
+            self._rx_len = rest
+        return data
+
+    def _apply_timeout(self, timeout: float) -> None:
+        if timeout != self._applied_timeout:
+            self.serial.timeout = timeout
+            self._applied_timeout = timeout
 
     def is_connected(self) -> bool:
         return self.serial is not None and self.serial.is_open 
\ No newline at end of file
@@ -1,5 +1,6 @@
 import pytest
 from serial_comm.mock import MockSerialPort
+from serial_comm.exceptions import SerialTimeoutError
 from serial_comm.protocol import send_command_and_wait_for_response
 
 def test_send_command_and_wait_for_response():
@@ -13,4 +14,26 @@ def test_send_command_and_wait_for_response():
         timeout=1.0
     )
     assert response == b':03CS12345678\r\n'
-    assert port.sent_data == [b':02CS\r\n'] 
\ No newline at end of file
+    assert port.sent_data == [b':02CS\r\n'] 
+
+def test_send_command_and_wait_for_response_joins_chunks():
+    port = MockSerialPort()
+    port.connect()
+    port.queue_response(b':03CS1234')
+    port.queue_response(b'5678\r\n')
+    response = send_command_and_wait_for_response(port, command=b':02CS\r\n', timeout=1.0)
+    assert response == b':03CS12345678\r\n'
+
+def test_send_command_and_wait_for_response_timeout():
+    port = MockSerialPort()
+    port.connect()
+    with pytest.raises(SerialTimeoutError):
+        send_command_and_wait_for_response(port, command=b':02CS\r\n', timeout=0.1, max_attempts=2)
+    assert port.sent_data == [b':02CS\r\n'] * 2
+
+def test_send_command_and_wait_for_response_coalesced_frames():
+    port = MockSerialPort()
+    port.connect()
+    port.queue_response(b':03CS12345678\r\n:00\r\n')
+    assert send_command_and_wait_for_response(port, command=b':02CS\r\n') == b':03CS12345678\r\n'
+    assert send_command_and_wait_for_response(port, command=b':04CS\r\n') == b':00\r\n'
@@ -0,0 +1,76 @@
+import pytest
+from serial_comm.config import SerialConfig
+from serial_comm.exceptions import SerialTimeoutError
+from serial_comm import serial_port
+from serial_comm.serial_port import PySerialPort
+
+class FakeSerial:
+    """Stands in for serial.Serial: returns buffered bytes without blocking and counts reads."""
+    def __init__(self, data: bytes = b''):
+        self.buffer = bytearray(data)
+        self.is_open = True
+        self._timeout = None
+        self.timeout_sets = 0
+        self.reads = 0
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value):
+        self.timeout_sets += 1
+        self._timeout = value
+
+    @property
+    def in_waiting(self):
+        return len(self.buffer)
+
+    def read(self, size=1):
+        self.reads += 1
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+def make_port(data: bytes) -> PySerialPort:
+    port = PySerialPort(SerialConfig(port='TEST'))
+    port.serial = FakeSerial(data)
+    return port
+
+def test_receive_frames_buffered_responses():
+    port = make_port(b':03AB\r\n:04CD\r\n')
+    assert port.receive() == b':03AB\r\n'
+    assert port.receive_until(b'\r\n', timeout=0.1) == b':04CD\r\n'
+    # Both responses came out of a single read of everything the driver had
+    assert port.serial.reads == 1
+
+def test_receive_timeout():
+    port = make_port(b'')
+    with pytest.raises(SerialTimeoutError):
+        port.receive(timeout=0.05)
+
+def test_unchanged_timeout_is_not_reapplied():
+    port = make_port(b'')
+    for _ in range(3):
+        with pytest.raises(SerialTimeoutError):
+            port.receive(timeout=0.01)
+    assert port.serial.timeout_sets == 1
+
+def test_receive_frame_longer_than_buffer():
+    port = PySerialPort(SerialConfig(port='TEST', max_frame_size=8))
+    port.serial = FakeSerial(b':03' + b'A' * 20 + b'\r\n:04\r\n')
+    assert port.receive() == b':03' + b'A' * 20 + b'\r\n'
+    assert port.receive() == b':04\r\n'
+
+def test_creating_a_port_leaves_debug_flag_alone():
+    serial_port.configure_debug(True)
+    try:
+        PySerialPort(SerialConfig(port='TEST', log_level='INFO'))
+        assert serial_port._DEBUG_ENABLED
+    finally:
+        serial_port.configure_debug(False)
@@ -0,0 +1,10 @@
+# The whole test run gets a throwaway cache directory, so loading config (which caches its
+# parse under XDG_CACHE_HOME / LOCALAPPDATA) never writes into the developer's home directory.
+import atexit
+import os
+import shutil
+import tempfile
+
+_CACHE_DIR = tempfile.mkdtemp(prefix='aquaphotomics-test-cache-')
+os.environ['XDG_CACHE_HOME'] = os.environ['LOCALAPPDATA'] = _CACHE_DIR
+atexit.register(shutil.rmtree, _CACHE_DIR, True)
@@ -0,0 +1,177 @@
+import dataclasses
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import yaml
+
+from src.aquaphotomics.config import config_manager
+from src.aquaphotomics.config.config_manager import Config, OutputConfig, SerialConfig
+
+SAMPLE_CONFIG = """\
+output:
+  directory: output_data
+serial:
+  com_port: "COM7"
+  baud_rate: 9600
+"""
+
+class TestConfig(unittest.TestCase):
+
+    def setUp(self):
+        """Write a sample config file into a fresh temporary directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.config_file = os.path.join(self.tmp_dir, 'config.yaml')
+        with open(self.config_file, 'w') as f:
+            f.write(SAMPLE_CONFIG)
+
+        config_manager._CONFIG_CACHE.clear()
+        self.addCleanup(config_manager._CONFIG_CACHE.clear)
+
+        # Keep the parsed-config cache out of the real user cache directory
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        env_patcher = patch.dict(os.environ, {'XDG_CACHE_HOME': self.cache_dir, 'LOCALAPPDATA': self.cache_dir})
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+
+    def test_load_sections(self):
+        """Sections are exposed with attribute access."""
+        cfg = Config(self.config_file)
+        self.assertEqual(cfg.serial.com_port, "COM7")
+        self.assertEqual(cfg.serial.baud_rate, 9600)
+        self.assertEqual(cfg.output.directory, "output_data")
+
+    def test_known_sections_are_dataclasses(self):
+        """output/serial become frozen, slotted dataclasses; unknown keys are dropped."""
+        with open(self.config_file, 'a') as f:
+            f.write("  not_a_setting: 1\n")
+        cfg = Config(self.config_file)
+        self.assertIsInstance(cfg.output, OutputConfig)
+        self.assertIsInstance(cfg.serial, SerialConfig)
+        self.assertFalse(hasattr(cfg.serial, 'not_a_setting'))
+        self.assertFalse(hasattr(cfg.serial, '__dict__'))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            cfg.serial.baud_rate = 1
+
+    def test_unchanged_file_is_parsed_once(self):
+        """A second Config() on an unchanged file reuses the cached parse."""
+        with patch('yaml.load', side_effect=yaml.load) as mock_load:
+            self.assertEqual(Config(self.config_file).serial.com_port, "COM7")
+            self.assertEqual(Config(self.config_file).serial.com_port, "COM7")
+        self.assertEqual(mock_load.call_count, 1)
+
+    def test_parse_is_reused_across_processes_via_json_cache(self):
+        """A fresh process (empty in-memory cache) loads the cached JSON instead of the YAML."""
+        Config(self.config_file).serial
+        self.assertTrue(os.path.isfile(config_manager._json_cache_path(self.config_file)))
+        self.assertTrue(config_manager._json_cache_path(self.config_file).startswith(self.cache_dir))
+        config_manager._CONFIG_CACHE.clear()
+        with patch('yaml.load') as mock_load:
+            cfg = Config(self.config_file)
+            self.assertEqual(cfg.serial.com_port, "COM7")
+        mock_load.assert_not_called()
+
+    def test_loading_never_writes_next_to_config_file(self):
+        """Loading a config leaves its directory untouched, read-only or inside the package."""
+        os.chmod(self.tmp_dir, 0o555)
+        self.addCleanup(os.chmod, self.tmp_dir, 0o755)
+        package_file = os.path.join(os.path.dirname(config_manager.__file__), 'config.yaml')
+        for config_file in (self.config_file, package_file):
+            config_dir = os.path.dirname(config_file)
+            before = sorted(os.listdir(config_dir))
+            config_manager._CONFIG_CACHE.clear()
+            Config(config_file).serial
+            self.assertEqual(sorted(os.listdir(config_dir)), before)
+
+    def test_modified_file_is_reparsed(self):
+        """Changing the file's mtime invalidates the cached parse."""
+        Config(self.config_file).serial
+        with open(self.config_file, 'w') as f:
+            f.write(SAMPLE_CONFIG.replace("COM7", "COM8"))
+        stat = os.stat(self.config_file)
+        os.utime(self.config_file, (stat.st_atime, stat.st_mtime + 10))
+
+        cfg = Config(self.config_file)
+        self.assertEqual(cfg.serial.com_port, "COM8")
+
+    def test_file_is_not_read_until_first_access(self):
+        """Constructing Config does no I/O; the first section access loads the file."""
+        os.remove(self.config_file)
+        cfg = Config(self.config_file)
+        self.assertFalse(os.path.exists(self.config_file))
+        self.assertEqual(cfg.serial.com_port, 'COM4')
+        self.assertEqual(cfg.output.directory, 'output_data')
+        self.assertTrue(os.path.isfile(self.config_file))
+
+    def test_default_file_is_readable_without_libyaml(self):
+        """Without the C dumper the default file is still block-style YAML that reads back the same."""
+        os.remove(self.config_file)
+        with patch.object(config_manager, '_YamlDumper', yaml.SafeDumper):
+            self.assertTrue(Config(self.config_file)._create_default_config())
+        with open(self.config_file) as f:
+            text = f.read()
+        self.assertTrue(text.startswith('output:\n'))
+        self.assertEqual(yaml.safe_load(text), config_manager._DEFAULTS)
+
+    def test_invalid_serial_settings_fall_back_to_defaults(self):
+        """Mistyped, out-of-range and missing serial settings are replaced by defaults."""
+        with open(self.config_file, 'w') as f:
+            f.write("serial:\n  baud_rate: fast\n  command_timeout: -1\n  use_mock_device: 1\n  read_interval: 0.02\n")
+        cfg = Config(self.config_file)
+        self.assertEqual(cfg.serial.baud_rate, 115200)
+        self.assertEqual(cfg.serial.command_timeout, 30.0)
+        self.assertIs(cfg.serial.use_mock_device, False)
+        self.assertEqual(cfg.serial.read_interval, 0.02)
+        self.assertEqual(cfg.serial.com_port, 'COM4')
+
+    def test_zero_durations_fall_back_to_defaults(self):
+        """Timeouts and polling intervals must be positive; the delays may be zero."""
+        with open(self.config_file, 'w') as f:
+            f.write("serial:\n  command_timeout: 0\n  read_interval: 0\n  log_interval: 0.0\n"
+                    "  read_timeout: 0\n  write_timeout: 0\n  handshake_timeout_s: 0\n"
+                    "  handshake_poll_interval_s: 0\n  command_delay: 0\n  reconnect_delay: 0\n")
+        serial = Config(self.config_file).serial
+        for name in ('command_timeout', 'read_interval', 'log_interval', 'read_timeout',
+                     'write_timeout', 'handshake_timeout_s', 'handshake_poll_interval_s'):
+            self.assertEqual(getattr(serial, name), config_manager._DEFAULT_SERIAL[name], name)
+        self.assertEqual(serial.command_delay, 0)
+        self.assertEqual(serial.reconnect_delay, 0)
+
+    def test_missing_settings_are_merged_from_defaults(self):
+        """Settings absent from the file fall back to defaults; present ones win."""
+        cfg = Config(self.config_file)
+        self.assertEqual(cfg.output.directory, "output_data")
+        self.assertEqual(cfg.output.timestamp_format, "%Y%m%d_%H%M%S")
+        self.assertEqual(cfg.serial.baud_rate, 9600)
+        self.assertEqual(cfg.serial.command_timeout, 30.0)
+        self.assertEqual(config_manager._DEFAULT_SERIAL['baud_rate'], 115200)
+
+    def test_format_timestamp_uses_configured_format(self):
+        with open(self.config_file, 'w') as f:
+            f.write('output:\n  timestamp_format: "%Y-%m-%d"\n')
+        cfg = Config(self.config_file)
+        self.assertEqual(cfg.output.format_timestamp(datetime(2024, 1, 2, 3, 4, 5)), "2024-01-02")
+
+    def test_empty_file_uses_defaults(self):
+        open(self.config_file, 'w').close()
+        cfg = Config(self.config_file)
+        self.assertEqual(cfg.serial.com_port, 'COM4')
+        self.assertEqual(cfg.output.timestamp_format, "%Y%m%d_%H%M%S")
+
+    def test_default_config_is_shared(self):
+        """Config() always returns the module's instance; explicit files get their own."""
+        self.assertIs(Config(), config_manager.config)
+        self.assertIsNot(Config(self.config_file), Config(self.config_file))
+
+    def test_unknown_section_raises_attribute_error(self):
+        cfg = Config(self.config_file)
+        with self.assertRaises(AttributeError):
+            cfg.no_such_section
+
+if __name__ == '__main__':
+    unittest.main()
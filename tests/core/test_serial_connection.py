@@ -1,3 +1,7 @@
+import dataclasses
+import os
+import sys
+import threading
 import unittest
 from unittest.mock import MagicMock, patch, call
 import time
@@ -5,7 +9,9 @@ import serial # Needed for potential exceptions
 
 # --- Adjust the import path based on how tests are run ---
 # If tests are run from the project root:
-from src.aquaphotomics.core.serial_device import SerialConnection, SerialCommunicationError
+from src.aquaphotomics.core.serial_device import (SerialConnection, SerialCommunicationError,
+                                                  CommunicationLog, format_log_timestamp, invalidate_port_cache)
+from src.aquaphotomics.config.config_manager import config
 # If tests are run from the 'tests' directory, you might need path adjustments or different import:
 # import sys
 # sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
@@ -24,13 +30,14 @@ class MockSerial:
         self._in_waiting = 0
         self._read_buffer = b''
         
-        # Use MagicMock for methods to track calls
+        # Use MagicMock for the rarely called methods tests assert on
         self.write = MagicMock()
-        self.read = MagicMock(side_effect=self._read_effect)
         self.close = MagicMock(side_effect=self._close_effect)
-        self.flush = MagicMock()
-        self.reset_input_buffer = MagicMock()
-        self.reset_output_buffer = MagicMock()
+        self.open = MagicMock(side_effect=self._open_effect)
+        # Reads are plain methods: MagicMock's call recording dominates byte-at-a-time reads.
+        # Tests that assert on them call track() first.
+        self.read = self._read_effect
+        self.read_until = self._read_until_effect
 
     @property
     def is_open(self):
@@ -52,10 +59,40 @@ class MockSerial:
         # print(f"Mock Read: Asked for {size}, returning {data_to_read!r}, remaining: {self._read_buffer!r}") # Debug print
         return data_to_read
 
+    def _read_until_effect(self, expected=b'\n', size=None):
+        """Simulates serial.Serial.read_until: stop after the terminator or when the buffer runs dry."""
+        if not self._is_open:
+            raise serial.SerialException("Port not open")
+        end = self._read_buffer.find(expected)
+        end = len(self._read_buffer) if end == -1 else end + len(expected)
+        if size is not None:
+            end = min(end, size)
+        data_to_read = self._read_buffer[:end]
+        self._read_buffer = self._read_buffer[end:]
+        return data_to_read
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        pass
+
+    def reset_output_buffer(self):
+        pass
+
     def _close_effect(self):
         self._is_open = False
 
+    def _open_effect(self):
+        self._is_open = True
+
     # --- Methods to control the mock from tests ---
+    def track(self, name: str) -> MagicMock:
+        """Wrap a plain method in a MagicMock so its calls can be asserted."""
+        tracked = MagicMock(side_effect=getattr(self, name))
+        setattr(self, name, tracked)
+        return tracked
+
     def setup_read_buffer(self, data: bytes):
         """Set the data that the mock will return on read()."""
         self._read_buffer = data
@@ -95,6 +132,7 @@ class TestSerialConnection(unittest.TestCase):
         # Create the SerialConnection instance AFTER patching
         # Initialize without port/baud so connect is called explicitly in tests
         self.connection = SerialConnection()
+        invalidate_port_cache()
 
     def advance_time(self, seconds: float):
         """Helper to advance the mock time."""
@@ -108,7 +146,8 @@ class TestSerialConnection(unittest.TestCase):
         port = "COM_TEST"
         baud = 9600
         self.assertTrue(self.connection.connect(port, baud))
-        self.mock_Serial_class.assert_called_once_with(port=port, baudrate=baud, timeout=unittest.mock.ANY) # Check serial.Serial was called
+        self.mock_Serial_class.assert_called_once_with(port=port, baudrate=baud, timeout=unittest.mock.ANY,
+                                                       write_timeout=unittest.mock.ANY) # Check serial.Serial was called
         self.assertTrue(self.connection.is_connected())
         self.assertEqual(self.connection.serial_conn, self.mock_serial_instance)
         
@@ -129,6 +168,18 @@ class TestSerialConnection(unittest.TestCase):
         self.assertFalse(self.connection.is_connected())
         self.mock_serial_instance.close.assert_called_once()
 
+    def test_reconnect_reopens_existing_port(self):
+        """Connecting again with the same settings reopens the port rather than constructing a new one."""
+        self.connection.connect("COM_TEST", 9600)
+        self.mock_serial_instance.port = "COM_TEST"
+        self.mock_serial_instance.baudrate = 9600
+        self.connection.disconnect()
+
+        self.assertTrue(self.connection.connect("COM_TEST", 9600))
+        self.assertTrue(self.connection.is_connected())
+        self.mock_Serial_class.assert_called_once()
+        self.mock_serial_instance.open.assert_called_once()
+
     # --- Tests for send_command_and_with_response_polling --- 
     # We will add many more tests here for the complex method
     
@@ -156,8 +207,222 @@ class TestSerialConnection(unittest.TestCase):
         self.assertEqual(log['sent'], command)
         self.assertEqual(log['received'], expected_response)
         self.assertTrue(log['success'])
+        self.assertIsInstance(log['timestamp_ns'], int)
+
+    def test_send_command_accepts_bytes(self):
+        """Pre-encoded commands are written as-is with CRLF appended."""
+        self.connection.connect("COM_TEST", 9600)
+        self.mock_serial_instance.setup_read_buffer(b':0801ABCD\r\n')
+
+        response = self.connection.send_command_and_with_response_polling(b':0701', row=0, col=0)
+
+        self.assertEqual(response, ':0801ABCD')
+        self.mock_serial_instance.write.assert_called_once_with(b':0701\r\n')
+        self.assertEqual(self.connection.communication_log[0]['sent'], ':0701')
+
+    def test_send_command_retry_uses_growing_timeout(self):
+        """A timed-out attempt is retried with four times the previous timeout."""
+        self.connection.connect("COM_TEST", 9600)
+        with patch.object(self.connection, 'wait_for_response',
+                          side_effect=[("", False, 1.0), (":0801", True, 0.1)]) as mock_wait, \
+             patch.object(self.connection, 'try_reconnect', return_value=True):
+            response = self.connection.send_command_and_with_response_polling(":0701", row=0, col=0)
+
+        self.assertEqual(response, ":0801")
+        first, second = (c.kwargs['timeout'] for c in mock_wait.call_args_list)
+        self.assertEqual(second, first * 4)
+        self.assertEqual([entry['success'] for entry in self.connection.communication_log], [False, True])
+
+    # --- Tests for wait_for_response ---
+
+    def test_wait_for_response_complete_on_crlf(self):
+        """First byte is read blocking, the rest framed by read_until."""
+        self.connection.connect("COM_TEST", 9600)
+        self.mock_serial_instance.setup_read_buffer(b':0801ABCD\r\n')
+        self.mock_serial_instance.track('read')
+        self.mock_serial_instance.track('read_until')
+
+        response, is_complete, elapsed = self.connection.wait_for_response(timeout=1.0, read_interval=0.01)
+
+        self.assertEqual(response, ':0801ABCD')
+        self.assertTrue(is_complete)
+        self.mock_serial_instance.read.assert_called_once_with(1)
+        self.mock_serial_instance.read_until.assert_called_once_with(b'\r\n')
+
+    def test_wait_for_response_idle_completion(self):
+        """A response without CRLF completes once the line stays idle."""
+        self.connection.connect("COM_TEST", 9600)
+        self.mock_serial_instance.setup_read_buffer(b':55555555\r')
+
+        response, is_complete, _ = self.connection.wait_for_response(timeout=1.0, read_interval=0.01)
+
+        self.assertEqual(response, ':55555555')
+        self.assertTrue(is_complete)
+
+    def test_wait_for_response_crlf_only_when_idle_completion_disabled(self):
+        """With complete_on_idle off, a response without CRLF runs to the timeout."""
+        self.connection.connect("COM_TEST", 9600)
+        self.mock_serial_instance.setup_read_buffer(b':55555555\r')
+        read_until = self.mock_serial_instance.read_until
+
+        def slow_read_until(*args, **kwargs):
+            self.advance_time(0.6)
+            return read_until(*args, **kwargs)
+        self.mock_serial_instance.read_until = slow_read_until
+
+        serial_config = dataclasses.replace(config.serial, complete_on_idle=False)
+        with patch.object(config, 'serial', serial_config):
+            response, is_complete, _ = self.connection.wait_for_response(timeout=1.0, read_interval=0.01)
+
+        self.assertEqual(response, ':55555555')
+        self.assertFalse(is_complete)
+
+    def test_wait_for_response_from_background_reader(self):
+        """With background_reader on, a reader thread feeds wait_for_response."""
+        self.mock_serial_instance.setup_read_buffer(b':0801ABCD\r\n')
+        self.mock_serial_instance.track('read_until')
+        serial_config = dataclasses.replace(config.serial, background_reader=True)
+        with patch.object(config, 'serial', serial_config):
+            self.connection.connect("COM_TEST", 9600)
+            self.addCleanup(self.connection.disconnect)
+            response, is_complete, _ = self.connection.wait_for_response(timeout=1.0, read_interval=0.01)
+
+        self.assertEqual(response, ':0801ABCD')
+        self.assertTrue(is_complete)
+        self.mock_serial_instance.read_until.assert_not_called()
+
+    def test_background_reader_drops_stale_bytes_before_command(self):
+        """A partial reply left over from an earlier command isn't taken as the start of the next one."""
+        self.mock_serial_instance.setup_read_buffer(b':08FF')
+        self.mock_serial_instance.write.side_effect = (
+            lambda data: self.mock_serial_instance.setup_read_buffer(b':0801ABCD\r\n'))
+        serial_config = dataclasses.replace(config.serial, background_reader=True)
+        with patch.object(config, 'serial', serial_config):
+            self.connection.connect("COM_TEST", 9600)
+            self.addCleanup(self.connection.disconnect)
+            # Let the reader pick up the stale bytes first
+            self.assertTrue(self.connection._rx_event.wait(1.0))
+            self.assertEqual(bytes(self.connection._rx), b':08FF')
+            response = self.connection.send_command_and_with_response_polling(':0701', row=0, col=0)
+
+        self.assertEqual(response, ':0801ABCD')
+
+    def test_wait_for_response_non_ascii(self):
+        """Non-ASCII responses are returned as space-separated hex."""
+        self.connection.connect("COM_TEST", 9600)
+        self.mock_serial_instance.setup_read_buffer(b'\xff\x01\r\n')
+
+        response, is_complete, _ = self.connection.wait_for_response(timeout=1.0, read_interval=0.01)
+
+        self.assertEqual(response, "Non-ASCII response: ff 01 0d 0a")
+        self.assertTrue(is_complete)
+
+    def test_wait_for_response_timeout(self):
+        """No data before the deadline returns an incomplete, empty response."""
+        self.connection.connect("COM_TEST", 9600)
+
+        def read_nothing(size=1):
+            self.advance_time(0.6)
+            return b''
+        self.mock_serial_instance.read = read_nothing
+
+        response, is_complete, elapsed = self.connection.wait_for_response(timeout=1.0, read_interval=0.01)
+
+        self.assertEqual(response, '')
+        self.assertFalse(is_complete)
+        self.assertGreaterEqual(elapsed, 1.0)
+
+    def test_wait_for_response_port_lost(self):
+        """A read error mid-wait ends the wait with an incomplete response."""
+        self.connection.connect("COM_TEST", 9600)
+        self.mock_serial_instance.read = MagicMock(side_effect=serial.SerialException("device disconnected"))
+
+        response, is_complete, _ = self.connection.wait_for_response(timeout=1.0, read_interval=0.01)
+
+        self.assertEqual(response, '')
+        self.assertFalse(is_complete)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), "fd fast path is Linux only")
+    def test_wait_for_response_reads_file_descriptor(self):
+        """On Linux the response is read straight from the port's descriptor."""
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        self.addCleanup(os.close, write_fd)
+        self.mock_serial_instance.fileno = lambda: read_fd
+        self.mock_serial_instance.track('read')
+        self.connection.connect("COM_TEST", 9600)
+        os.write(write_fd, b':0801ABCD\r\n')
+
+        response, is_complete, _ = self.connection.wait_for_response(timeout=1.0, read_interval=0.01)
+
+        self.assertEqual(response, ':0801ABCD')
+        self.assertTrue(is_complete)
+        self.mock_serial_instance.read.assert_not_called()
+
+    def test_get_available_ports_cached_until_disconnect(self):
+        """Port enumeration is reused within the TTL and redone after disconnect."""
+        port = MagicMock(device="COM_TEST")
+        with patch('serial.tools.list_ports.comports', return_value=[port]) as mock_comports:
+            self.assertEqual(self.connection.get_available_ports(), ["COM_TEST"])
+            self.assertEqual(self.connection.get_available_ports(), ["COM_TEST"])
+            self.assertEqual(mock_comports.call_count, 1)
+
+            self.connection.disconnect()
+            self.connection.get_available_ports()
+            self.assertEqual(mock_comports.call_count, 2)
+
+            invalidate_port_cache()
+            self.connection.get_available_ports()
+            self.assertEqual(mock_comports.call_count, 3)
+
+    def test_progress_watchdog_reuses_one_thread(self):
+        """Progress logging for successive commands runs on the connection's single watchdog thread."""
+        watchdog = self.connection._watchdog
+        calls = threading.Semaphore(0)
+        def callback():
+            calls.release()
+            return 0.01
+
+        threads = set()
+        for _ in range(3):
+            watchdog.arm(callback, 0)
+            # Called again after each returned delay until disarmed
+            self.assertTrue(calls.acquire(timeout=1.0) and calls.acquire(timeout=1.0))
+            watchdog.disarm()
+            threads.add(watchdog._thread)
+        self.assertEqual(len(threads), 1)
+        self.assertIsInstance(threads.pop(), threading.Thread)
+
+    def test_progress_watchdog_floors_reschedule_delay(self):
+        """A callback asking to run again immediately is still spaced out."""
+        watchdog = self.connection._watchdog
+        calls = []
+        def callback():
+            calls.append(1)
+            return 0
+        watchdog.arm(callback, 0)
+        threading.Event().wait(0.1)
+        watchdog.disarm()
+        self.assertLessEqual(len(calls), 0.1 / watchdog._MIN_DELAY_S + 2)
+
+    def test_format_log_timestamp(self):
+        """Log timestamps are nanoseconds rendered as local time with milliseconds."""
+        seconds = 1700000000
+        expected = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds)) + ".123"
+        self.assertEqual(format_log_timestamp(seconds * 1_000_000_000 + 123_456_789), expected)
+
+    def test_communication_log_drops_oldest_entries(self):
+        """The log keeps its columns aligned and evicts whole entries once full."""
+        log = CommunicationLog(maxlen=2)
+        for i in range(3):
+            log.append(i, f':0{i}', f':1{i}', i % 2 == 0)
+
+        self.assertEqual(len(log), 2)
+        self.assertEqual(log[0], {'timestamp_ns': 1, 'sent': ':01', 'received': ':11', 'success': False})
+        self.assertEqual([entry['sent'] for entry in log], [':01', ':02'])
+        self.assertEqual(list(log.success), [False, True])
 
-    # Add tests for: timeout, retry logic, idle completion, errors, reconnection etc.
+    # Add tests for: retry logic, errors, reconnection etc.
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
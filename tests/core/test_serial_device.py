@@ -1,9 +1,138 @@
-# Placeholder for tests related to core/serial_device.py
+# Tests for core/serial_device.py (SerialConnection itself is covered in test_serial_connection.py)
+import dataclasses
 import unittest
+from unittest.mock import MagicMock, patch
+
+from src.aquaphotomics.config.config_manager import SerialConfig, config
+from src.aquaphotomics.core.serial_device import (SerialCommunicationError, SerialConnection,
+                                                  SerialDeviceController)
 
 class TestSerialDevice(unittest.TestCase):
     def test_placeholder(self):
         self.assertTrue(True)
 
+class TestSerialDeviceControllerWithTwin(unittest.TestCase):
+    """The controller driving the digital twin through a SerialConnection."""
+
+    def setUp(self):
+        serial_config = dataclasses.replace(SerialConfig(), use_mock_device=True)
+        self.controller = SerialDeviceController(serial_config)
+        self.assertTrue(self.controller.connect('MOCK_COM'))
+        self.addCleanup(self.controller.disconnect)
+        # No simulated processing delay, so the tests run quickly
+        self.controller.serial_conn.serial_conn.max_delay = 0
+
+    def test_connect_uses_serial_connection(self):
+        self.assertIsInstance(self.controller.serial_conn, SerialConnection)
+        self.assertTrue(self.controller.is_connected())
+
+    def test_read_signal(self):
+        self.assertIn(self.controller.read_signal_from_channel(3, 1), (0, 1, 0xFFFFFFFF))
+
+    def test_measure_channel(self):
+        readings = self.controller.measure_channel(3)
+        self.assertEqual(len(readings), 3)
+        self.assertTrue(all(0 <= value <= 0xFFFF for value in readings))
+
+    def test_write_signal_and_toggle_led_are_acknowledged(self):
+        self.assertTrue(self.controller.write_signal_to_channel(3, 0, 1000))
+        self.assertTrue(self.controller.toggle_led(3, 1))
+
+    def test_recovers_after_timed_out_attempt(self):
+        """A lost reply triggers a reconnect; the retry and later commands still get through."""
+        twin = self.controller.serial_conn.serial_conn
+        write = twin.write
+        dropped = []
+        def drop_first_measure(data):
+            if data.startswith(b':07') and not dropped:
+                dropped.append(data)
+                return
+            write(data)
+        twin.write = drop_first_measure
+
+        serial_config = dataclasses.replace(config.serial, command_timeout=0.1, reconnect_delay=0)
+        with patch.object(config, 'serial', serial_config):
+            self.assertEqual(len(self.controller.measure_channel(3)), 3)
+            self.assertTrue(dropped)
+            self.assertTrue(self.controller.is_connected())
+            self.assertEqual(len(self.controller.measure_channel(4)), 3)
+        self.assertEqual(self.controller.serial_conn.com_port, 'MOCK_COM')
+
+    def test_handshake_ignores_stale_reply(self):
+        """A reply nobody read is discarded before the handshake instead of answering it."""
+        twin = self.controller.serial_conn.serial_conn
+        twin.write(b':0701\r\n')
+        self.assertTrue(self.controller.write_signal_to_channel(3, 0, 1000))
+
+    def test_disconnect(self):
+        self.controller.disconnect()
+        self.assertFalse(self.controller.is_connected())
+
+class TestSerialDeviceControllerResponses(unittest.TestCase):
+    """Parsing of device replies, with a SerialConnection stand-in returning canned responses."""
+
+    def setUp(self):
+        self.controller = SerialDeviceController(SerialConfig())
+        self.controller.serial_conn = MagicMock(spec=SerialConnection)
+        self.controller.serial_conn.is_connected.return_value = True
+
+    def reply_with(self, response: str):
+        # The first reply answers the handshake sent before every command
+        send = self.controller.serial_conn.send_command_and_with_response_polling
+        send.reset_mock()
+        send.side_effect = [':55555555', response]
+
+    def test_read_signal(self):
+        self.reply_with(':033112345678')
+        self.assertEqual(self.controller.read_signal_from_channel(3, 1), 0x12345678)
+
+    def test_read_signal_rejects_short_reply(self):
+        self.reply_with(':03311234567')
+        with self.assertRaises(SerialCommunicationError):
+            self.controller.read_signal_from_channel(3, 1)
+
+    def test_read_signal_rejects_non_hex_reply(self):
+        for response in (':03311234567G', ':033112 34 56', ':0331 1234567'):
+            with self.subTest(response=response):
+                self.reply_with(response)
+                with self.assertRaises(SerialCommunicationError):
+                    self.controller.read_signal_from_channel(3, 1)
+
+    def test_measure_channel(self):
+        self.reply_with(':0803000100020003')
+        self.assertEqual(self.controller.measure_channel(3), (1, 2, 3))
+
+    def test_measure_channel_rejects_short_reply(self):
+        self.reply_with(':080300010002000')
+        with self.assertRaises(SerialCommunicationError):
+            self.controller.measure_channel(3)
+
+    def test_measure_channel_rejects_non_hex_reply(self):
+        for response in (':080300010002000X', ':08030001 0002 03'):
+            with self.subTest(response=response):
+                self.reply_with(response)
+                with self.assertRaises(SerialCommunicationError):
+                    self.controller.measure_channel(3)
+
+    def test_command_wire_bytes(self):
+        """Each command template yields the exact bytes the firmware expects."""
+        send = self.controller.serial_conn.send_command_and_with_response_polling
+        cases = [
+            (lambda: self.controller.read_signal_from_channel(10, 2), ':03A200000001', b':02A2'),
+            (lambda: self.controller.write_signal_to_channel(10, 2, 0x1F4), ':00', b':04A2000001F4'),
+            (lambda: self.controller.measure_channel(10), ':080A000100020003', b':070A'),
+            (lambda: self.controller.toggle_led(10, 1), ':00', b':080A00000001'),
+        ]
+        for action, response, expected in cases:
+            with self.subTest(command=expected):
+                self.reply_with(response)
+                action()
+                self.assertEqual([c.args[0] for c in send.call_args_list], [b':00', expected])
+
+    def test_failed_handshake(self):
+        self.controller.serial_conn.send_command_and_with_response_polling.side_effect = ['']
+        with self.assertRaises(SerialCommunicationError):
+            self.controller.measure_channel(3)
+
 if __name__ == '__main__':
     unittest.main()